@@ -5,9 +5,11 @@ Orchestrates between frontend and science team's AI workflow.
 
 Owner: Backend Engineering Team
 """
-from fastapi import FastAPI, HTTPException
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Science team imports
 from science.agents import TaxConsultationWorkflow
@@ -15,8 +17,13 @@ from science.agents import TaxConsultationWorkflow
 # Backend eng imports
 from backend_eng.config import backend_config
 from backend_eng.models.schemas import ChatRequest, EditMessageRequest
-from backend_eng.services.session_service import workflow_state_to_case_file
-from backend_eng.services.stream_service import stream_chat_response, stream_force_final_response
+from backend_eng.services.session_service import session_etag, workflow_state_to_case_file
+from backend_eng.services.stream_service import (
+    chat_response_events,
+    collect_events,
+    force_final_response_events,
+    sse_stream
+)
 from backend_eng.utils.validation import contains_sensitive_info, get_sensitive_info_error_message
 
 # Initialize FastAPI app
@@ -37,6 +44,28 @@ app.add_middleware(
 # Initialize science team's workflow
 tax_workflow = TaxConsultationWorkflow()
 
+# Headers for every server-sent event response
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Content-Type": "text/event-stream",
+}
+
+
+def _etag_headers(etag: Optional[str]) -> Optional[dict]:
+    """Cache headers for session reads: clients may reuse a response but must revalidate it"""
+    if etag is None:
+        return None
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(request: Request, etag: Optional[str]) -> bool:
+    """Whether the client's If-None-Match already names the current ETag"""
+    if etag is None:
+        return False
+    if_none_match = request.headers.get("if-none-match", "")
+    return any(tag.strip() in (etag, f"W/{etag}", "*") for tag in if_none_match.split(","))
+
 
 @app.get("/health")
 async def health_check():
@@ -54,16 +83,17 @@ async def create_session():
         # Convert to frontend format
         case_file = workflow_state_to_case_file(result)
 
-        return {
+        # Dumped in JSON mode and returned as a response, so the payload is encoded once
+        return JSONResponse({
             "session_id": result['session_id'],
-            "case_file": case_file.model_dump()
-        }
+            "case_file": case_file.model_dump(mode="json")
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/session/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, request: Request):
     """Get session details"""
     try:
         # Get debug info from science team
@@ -71,6 +101,11 @@ async def get_session(session_id: str):
         if "error" in debug_info:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        # Unchanged since the client's copy: skip rebuilding the case file
+        etag = session_etag(session_id, debug_info.get('checkpoint_id'))
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers=_etag_headers(etag))
+
         # Create a mock workflow result for conversion
         mock_result = {
             'session_id': session_id,
@@ -80,33 +115,65 @@ async def get_session(session_id: str):
         }
 
         case_file = workflow_state_to_case_file(mock_result)
-        return {"case_file": case_file.model_dump()}
+        return JSONResponse({"case_file": case_file.model_dump(mode="json")}, headers=_etag_headers(etag))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/session/{session_id}/workflow_summary")
-async def get_workflow_summary(session_id: str):
+async def get_workflow_summary(session_id: str, request: Request):
     """Get workflow session summary"""
     try:
-        summary = await tax_workflow.get_session_summary(session_id)
-        if not summary:
+        checkpoint = await tax_workflow.get_session_checkpoint(session_id)
+        if checkpoint is None:
             raise HTTPException(status_code=404, detail="Session not found")
-        return summary
+
+        state, checkpoint_id = checkpoint
+        etag = session_etag(session_id, checkpoint_id)
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers=_etag_headers(etag))
+
+        summary = tax_workflow.build_session_summary(session_id, state)
+        return JSONResponse(summary, headers=_etag_headers(etag))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _wants_json(request: Request) -> bool:
+    """Whether the client asked for a single JSON response rather than an event stream"""
+    accept = request.headers.get("accept", "")
+    return "application/json" in accept and "text/event-stream" not in accept
+
+
+async def _event_response(request: Request, events) -> Response:
+    """
+    Send a response's events as server-sent events, or as one JSON payload
+
+    Args:
+        request: Incoming request (its Accept header picks the format)
+        events: Function returning the event payloads; called with delay=0 for
+            JSON so no server-side pacing is applied
+    """
+    if _wants_json(request):
+        return JSONResponse(await collect_events(events(delay=0)))
+
+    return StreamingResponse(sse_stream(events()), media_type="text/plain", headers=_SSE_HEADERS)
+
+
 @app.post("/chat")
-async def chat(request: ChatRequest):
-    """Chat endpoint with streaming response"""
+async def chat(request: ChatRequest, http_request: Request):
+    """Chat endpoint with streaming response (or one JSON response for Accept: application/json)"""
 
     # Check for sensitive information
     if contains_sensitive_info(request.message):
         error_msg = get_sensitive_info_error_message()
         return {"content": error_msg}
 
-    async def generate():
+    async def events(delay: Optional[float] = None):
         try:
             # Call science team's workflow
             result = await tax_workflow.continue_consultation(request.session_id, request.message)
@@ -116,7 +183,7 @@ async def chat(request: ChatRequest):
                 if "Session not found" in result["error"]:
                     result = await tax_workflow.start_consultation(request.message)
                 else:
-                    yield f"data: {{'content': '{result['error']}', 'is_final': true}}\n\n"
+                    yield {'content': result['error'], 'is_final': True}
                     return
 
             response_content = result.get("message", "")
@@ -125,30 +192,23 @@ async def chat(request: ChatRequest):
             case_file = workflow_state_to_case_file(result)
 
             # Stream response
-            async for chunk in stream_chat_response(
+            async for event in chat_response_events(
                 response_content,
                 result,
-                case_file.model_dump()
+                case_file.model_dump(mode="json"),
+                delay
             ):
-                yield chunk
+                yield event
 
         except Exception as e:
             error_msg = f"I apologize, but I encountered an error: {str(e)}"
-            yield f"data: {{'content': '{error_msg}', 'is_final': true}}\n\n"
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-        }
-    )
+            yield {'content': error_msg, 'is_final': True}
+
+    return await _event_response(http_request, events)
 
 
 @app.post("/message/edit")
-async def edit_message(request: EditMessageRequest):
+async def edit_message(request: EditMessageRequest, http_request: Request):
     """Edit a previous message (currently implemented as continuation)"""
 
     # Check for sensitive information
@@ -156,14 +216,14 @@ async def edit_message(request: EditMessageRequest):
         error_msg = get_sensitive_info_error_message()
         return {"content": error_msg, "quick_replies": None}
 
-    async def generate():
+    async def events(delay: Optional[float] = None):
         try:
             # Note: LangGraph doesn't support true message editing
             # Treating as continuation for now
             result = await tax_workflow.continue_consultation(request.session_id, request.new_content)
 
             if "error" in result:
-                yield f"data: {{'content': '{result['error']}', 'is_final': true}}\n\n"
+                yield {'content': result['error'], 'is_final': True}
                 return
 
             response_content = result.get("message", "")
@@ -172,49 +232,45 @@ async def edit_message(request: EditMessageRequest):
             case_file = workflow_state_to_case_file(result)
 
             # Stream response
-            async for chunk in stream_chat_response(
+            async for event in chat_response_events(
                 response_content,
                 result,
-                case_file.model_dump()
+                case_file.model_dump(mode="json"),
+                delay
             ):
-                yield chunk
+                yield event
 
         except Exception as e:
             error_msg = f"I apologize, but I encountered an error: {str(e)}"
-            yield f"data: {{'content': '{error_msg}', 'is_final': true}}\n\n"
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
-        }
-    )
+            yield {'content': error_msg, 'is_final': True}
+
+    return await _event_response(http_request, events)
 
 
 @app.post("/session/{session_id}/force_final")
-async def force_final_suggestions(session_id: str):
+async def force_final_suggestions(session_id: str, http_request: Request):
     """Force transition to final suggestions"""
     try:
-        summary = await tax_workflow.get_session_summary(session_id)
-        if not summary:
+        # This snapshot is only for the check below; the analysis runs later, inside
+        # the stream, and re-reads the session so turns finished since aren't lost
+        state = await tax_workflow.get_session_state(session_id)
+        if state is None:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        summary = tax_workflow.build_session_summary(session_id, state)
         if not summary.get('has_sufficient_tags', False):
             raise HTTPException(
                 status_code=400,
                 detail="Cannot provide final suggestions yet. Please provide more information first."
             )
 
-        async def generate():
+        async def events(delay: Optional[float] = None):
             try:
                 # Force transition via science team
                 result = await tax_workflow.force_forms_analysis(session_id)
 
                 if "error" in result:
-                    yield f"data: {{'content': '{result['error']}', 'is_final': true}}\n\n"
+                    yield {'content': result['error'], 'is_final': True}
                     return
 
                 response_content = result.get("message", "")
@@ -223,26 +279,19 @@ async def force_final_suggestions(session_id: str):
                 case_file = workflow_state_to_case_file(result)
 
                 # Stream response
-                async for chunk in stream_force_final_response(
+                async for event in force_final_response_events(
                     response_content,
                     result,
-                    case_file.model_dump()
+                    case_file.model_dump(mode="json"),
+                    delay
                 ):
-                    yield chunk
+                    yield event
 
             except Exception as e:
                 error_msg = f"Error generating final suggestions: {str(e)}"
-                yield f"data: {{'content': '{error_msg}', 'is_final': true}}\n\n"
-
-        return StreamingResponse(
-            generate(),
-            media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
-            }
-        )
+                yield {'content': error_msg, 'is_final': True}
+
+        return await _event_response(http_request, events)
     except HTTPException:
         raise
     except Exception as e:
@@ -257,10 +306,14 @@ async def debug_session(session_id: str):
         if "error" in debug_info:
             raise HTTPException(status_code=404, detail=debug_info["error"])
         return debug_info
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Passed as an import string so reload can re-import it; uvicorn's default
+    # loop/http selection already uses uvloop and httptools when installed
+    uvicorn.run("backend_eng.api.main:app", host="0.0.0.0", port=8000, reload=backend_config.API_RELOAD)
\ No newline at end of file
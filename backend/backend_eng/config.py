@@ -25,10 +25,14 @@ class BackendConfig:
     # API Configuration
     API_TITLE: str = "Cross-Border Tax Consultant API"
     API_VERSION: str = "1.0.0"
+    # Restart on code changes when run via `python -m backend_eng.api.main` (development only)
+    API_RELOAD: bool = os.getenv("API_RELOAD", "").lower() in ("1", "true")
 
     # Streaming Configuration
-    STREAMING_CHAR_DELAY: float = 0.01  # Delay per character in streaming
-    STREAMING_FORCE_FINAL_DELAY: float = 0.005  # Faster delay for force final
+    # The frontend animates replies itself, so by default the server sends each reply
+    # in one event without pacing; a positive delay restores server-side pacing
+    STREAMING_CHAR_DELAY: float = 0.0  # Delay per character in streaming (applied per word chunk)
+    STREAMING_FORCE_FINAL_DELAY: float = 0.0  # Delay per character for force final
 
 
 backend_config = BackendConfig()
\ No newline at end of file
@@ -5,7 +5,7 @@ Pydantic models for request/response validation.
 
 Owner: Backend Engineering Team
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 from datetime import datetime
@@ -28,8 +28,6 @@ class MessageRole(str, Enum):
 
 class ChatMessage(BaseModel):
     """Individual chat message"""
-    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
-
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     role: MessageRole
     content: str
@@ -50,8 +48,6 @@ class UserProfile(BaseModel):
 
 class CaseFile(BaseModel):
     """Complete case file with all consultation data"""
-    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
-
     session_id: str
     user_profile: UserProfile = Field(default_factory=UserProfile)
     jurisdictions: List[str] = Field(default_factory=list)
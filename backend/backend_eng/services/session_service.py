@@ -6,9 +6,16 @@ and frontend format.
 
 Owner: Backend Engineering Team
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from backend_eng.models.schemas import CaseFile, ChatMessage, UserProfile, ConversationPhase
 
+# Map workflow phase to frontend conversation phase
+_PHASE_MAPPING = {
+    'intake': ConversationPhase.INTAKE,
+    'forms_analysis': ConversationPhase.CLARIFICATIONS,
+    'completed': ConversationPhase.FINAL_SUGGESTIONS
+}
+
 
 def workflow_state_to_case_file(workflow_result: Dict[str, Any]) -> CaseFile:
     """
@@ -20,7 +27,9 @@ def workflow_state_to_case_file(workflow_result: Dict[str, Any]) -> CaseFile:
     Returns:
         CaseFile object for frontend consumption
     """
-    state = workflow_result.get('state', {})
+    # force_forms_analysis nests the state under 'state'; the other workflow
+    # results carry the state fields at the top level
+    state = workflow_result.get('state', workflow_result)
 
     # Convert workflow messages to frontend ChatMessage format
     messages = []
@@ -33,13 +42,7 @@ def workflow_state_to_case_file(workflow_result: Dict[str, Any]) -> CaseFile:
         ))
 
     # Map workflow phase to frontend conversation phase
-    phase_mapping = {
-        'intake': ConversationPhase.INTAKE,
-        'forms_analysis': ConversationPhase.CLARIFICATIONS,
-        'completed': ConversationPhase.FINAL_SUGGESTIONS
-    }
-
-    conversation_phase = phase_mapping.get(
+    conversation_phase = _PHASE_MAPPING.get(
         workflow_result.get('current_phase', 'intake'),
         ConversationPhase.INTAKE
     )
@@ -72,4 +75,24 @@ def workflow_state_to_case_file(workflow_result: Dict[str, Any]) -> CaseFile:
         updated_at=state.get('updated_at', '')
     )
 
-    return case_file
\ No newline at end of file
+    return case_file
+
+
+def session_etag(session_id: str, checkpoint_id: Optional[str]) -> Optional[str]:
+    """
+    Build an ETag for responses derived from a session's state
+
+    Every write to the session creates a new checkpoint, so the tag changes
+    whenever anything in the session does, including writes that leave
+    updated_at alone.
+
+    Args:
+        session_id: Session ID
+        checkpoint_id: ID of the checkpoint the state was read from
+
+    Returns:
+        Quoted ETag value, or None if there is no checkpoint ID
+    """
+    if not checkpoint_id:
+        return None
+    return f'"{session_id}-{checkpoint_id}"'
@@ -6,12 +6,21 @@ Handles streaming responses for real-time UI updates.
 Owner: Backend Engineering Team
 """
 import json
+import re
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Iterator
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 from backend_eng.config import backend_config
 
+# A word together with the whitespace that follows it, or a run of leading whitespace
+_STREAM_CHUNK_RE = re.compile(r'\s+|\S+\s*')
+
 
 def json_encoder(obj):
     """Custom JSON encoder for datetime objects"""
@@ -20,14 +29,52 @@ def json_encoder(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
-async def stream_chat_response(
+def sse_event(payload: dict) -> str:
+    """Format a payload as a server-sent event, encoding it with orjson when available"""
+    if orjson is not None:
+        # orjson serializes datetimes natively; json_encoder only sees other unknown types
+        return f"data: {orjson.dumps(payload, default=json_encoder).decode()}\n\n"
+    return f"data: {json.dumps(payload, default=json_encoder)}\n\n"
+
+
+def iter_content_chunks(response_content: str) -> Iterator[str]:
+    """
+    Split response text into word-sized chunks for streaming
+
+    Sending one event per word instead of per character cuts the number of
+    events, JSON encodes and sleeps by roughly the average word length, while
+    the client still concatenates the chunks back into the same text.
+    """
+    for match in _STREAM_CHUNK_RE.finditer(response_content):
+        yield match.group(0)
+
+
+async def _content_events(response_content: str, delay: float) -> AsyncGenerator[dict, None]:
+    """
+    Split response text into content events
+
+    Without a delay the whole text goes out in one event and the client animates
+    it; with a delay it is sent as word-sized events paced per character. Each
+    event carries only new text, which clients append to what they have.
+    """
+    if delay <= 0:
+        if response_content:
+            yield {'content': response_content, 'is_final': False}
+        return
+
+    for chunk in iter_content_chunks(response_content):
+        yield {'content': chunk, 'is_final': False}
+        await asyncio.sleep(delay * len(chunk))
+
+
+async def chat_response_events(
     response_content: str,
     result: dict,
     case_file: dict,
     delay: float = None
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[dict, None]:
     """
-    Stream chat response character by character
+    Chat response content followed by the final workflow results
 
     Args:
         response_content: Full response text
@@ -36,18 +83,17 @@ async def stream_chat_response(
         delay: Delay between characters (uses config default if None)
 
     Yields:
-        Server-sent event strings
+        Event payloads
     """
     if delay is None:
         delay = backend_config.STREAMING_CHAR_DELAY
 
-    # Stream the content character by character
-    for char in response_content:
-        yield f"data: {json.dumps({'content': char, 'is_final': False})}\n\n"
-        await asyncio.sleep(delay)
+    # Stream the content (one event unless server-side pacing is configured)
+    async for event in _content_events(response_content, delay):
+        yield event
 
     # Send final message with workflow results including case_file
-    final_response = {
+    yield {
         'is_final': True,
         'session_id': result.get('session_id'),
         'current_phase': result.get('current_phase'),
@@ -57,32 +103,35 @@ async def stream_chat_response(
         'transition': result.get('transition', False),
         'case_file': case_file
     }
-    yield f"data: {json.dumps(final_response, default=json_encoder)}\n\n"
 
 
-async def stream_force_final_response(
+async def force_final_response_events(
     response_content: str,
     result: dict,
-    case_file: dict
-) -> AsyncGenerator[str, None]:
+    case_file: dict,
+    delay: float = None
+) -> AsyncGenerator[dict, None]:
     """
-    Stream force final response (faster than normal chat)
+    Force final response content followed by the forms analysis
 
     Args:
         response_content: Full response text
         result: Workflow result dictionary
         case_file: Case file dictionary
+        delay: Delay between characters (uses config default if None)
 
     Yields:
-        Server-sent event strings
+        Event payloads
     """
-    # Stream the content with faster delay
-    for char in response_content:
-        yield f"data: {json.dumps({'content': char, 'is_final': False})}\n\n"
-        await asyncio.sleep(backend_config.STREAMING_FORCE_FINAL_DELAY)
+    if delay is None:
+        delay = backend_config.STREAMING_FORCE_FINAL_DELAY
+
+    # Stream the content (one event unless server-side pacing is configured)
+    async for event in _content_events(response_content, delay):
+        yield event
 
     # Send final response with forms analysis
-    final_response = {
+    yield {
         'is_final': True,
         'session_id': result.get('session_id'),
         'current_phase': result.get('current_phase'),
@@ -90,4 +139,68 @@ async def stream_force_final_response(
         'forms_analysis': result.get('forms_analysis'),
         'case_file': case_file
     }
-    yield f"data: {json.dumps(final_response, default=json_encoder)}\n\n"
\ No newline at end of file
+
+
+async def sse_stream(events: AsyncIterator[dict]) -> AsyncGenerator[str, None]:
+    """Encode event payloads as server-sent events"""
+    async for event in events:
+        yield sse_event(event)
+
+
+def stream_chat_response(
+    response_content: str,
+    result: dict,
+    case_file: dict,
+    delay: float = None
+) -> AsyncGenerator[str, None]:
+    """
+    Stream chat response content followed by the final workflow results
+
+    Args:
+        response_content: Full response text
+        result: Workflow result dictionary
+        case_file: Case file dictionary
+        delay: Delay between characters (uses config default if None)
+
+    Yields:
+        Server-sent event strings
+    """
+    return sse_stream(chat_response_events(response_content, result, case_file, delay))
+
+
+def stream_force_final_response(
+    response_content: str,
+    result: dict,
+    case_file: dict
+) -> AsyncGenerator[str, None]:
+    """
+    Stream force final response content followed by the forms analysis
+
+    Args:
+        response_content: Full response text
+        result: Workflow result dictionary
+        case_file: Case file dictionary
+
+    Yields:
+        Server-sent event strings
+    """
+    return sse_stream(force_final_response_events(response_content, result, case_file))
+
+
+async def collect_events(events: AsyncIterator[dict]) -> dict:
+    """
+    Merge a response's events into a single payload
+
+    Used for clients that want one JSON response instead of a stream: the
+    result is the final event with the full content text added.
+    """
+    content_parts = []
+    final_event = {}
+    async for event in events:
+        if event.get('content'):
+            content_parts.append(event['content'])
+        final_event = event
+
+    payload = {'content': ''.join(content_parts)}
+    payload.update((key, value) for key, value in final_event.items() if key != 'content')
+    return payload
@@ -7,6 +7,25 @@ Owner: Backend Engineering Team
 """
 import re
 
+# Sensitive identifier formats, combined into one pattern so a message is scanned once
+_SENSITIVE_PATTERNS = [
+    r'\b\d{3}-\d{2}-\d{4}\b',    # SSN format (123-45-6789)
+    r'\b\d{9}\b',                # 9-digit numbers (potential SIN/SSN)
+    r'\b\d{3}\s\d{3}\s\d{3}\b',  # SIN format with spaces (123 456 789)
+    r'\b\d{3}-\d{3}-\d{3}\b',    # SIN format with dashes (123-456-789)
+    r'\b\d{4}\s\d{4}\s\d{4}\s\d{4}\b',  # Credit card format
+    r'\b[A-Z]\d{8}[A-Z]?\b',     # Passport format (rough)
+]
+_SENSITIVE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _SENSITIVE_PATTERNS))
+
+# Redactions applied by sanitize_message, in order
+_REDACTIONS = [
+    (re.compile(r'\b\d{3}-\d{2}-\d{4}\b'), '[SSN-REDACTED]'),
+    (re.compile(r'\b\d{9}\b'), '[ID-REDACTED]'),
+    (re.compile(r'\b\d{3}\s\d{3}\s\d{3}\b'), '[SIN-REDACTED]'),
+    (re.compile(r'\b\d{3}-\d{3}-\d{3}\b'), '[SIN-REDACTED]'),
+]
+
 
 def contains_sensitive_info(message: str) -> bool:
     """
@@ -18,19 +37,7 @@ def contains_sensitive_info(message: str) -> bool:
     Returns:
         True if sensitive information detected, False otherwise
     """
-    sensitive_patterns = [
-        r'\b\d{3}-\d{2}-\d{4}\b',    # SSN format (123-45-6789)
-        r'\b\d{9}\b',                # 9-digit numbers (potential SIN/SSN)
-        r'\b\d{3}\s\d{3}\s\d{3}\b',  # SIN format with spaces (123 456 789)
-        r'\b\d{3}-\d{3}-\d{3}\b',    # SIN format with dashes (123-456-789)
-        r'\b\d{4}\s\d{4}\s\d{4}\s\d{4}\b',  # Credit card format
-        r'\b[A-Z]\d{8}[A-Z]?\b',     # Passport format (rough)
-    ]
-
-    for pattern in sensitive_patterns:
-        if re.search(pattern, message):
-            return True
-    return False
+    return _SENSITIVE_RE.search(message) is not None
 
 
 def sanitize_message(message: str) -> str:
@@ -43,11 +50,9 @@ def sanitize_message(message: str) -> str:
     Returns:
         Sanitized message with sensitive data replaced
     """
-    # Replace SSN patterns
-    message = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '[SSN-REDACTED]', message)
-    message = re.sub(r'\b\d{9}\b', '[ID-REDACTED]', message)
-    message = re.sub(r'\b\d{3}\s\d{3}\s\d{3}\b', '[SIN-REDACTED]', message)
-    message = re.sub(r'\b\d{3}-\d{3}-\d{3}\b', '[SIN-REDACTED]', message)
+    # Replace SSN/SIN patterns
+    for pattern, placeholder in _REDACTIONS:
+        message = pattern.sub(placeholder, message)
 
     return message
 
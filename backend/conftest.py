@@ -0,0 +1,49 @@
+"""
+Shared pytest fixtures for the backend tests
+
+Tests never call a real model provider: nodes get a scripted fake LLM instead.
+"""
+import os
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+# Nodes build their LLM client on creation; a placeholder key lets them do so offline
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+# JSON answer that satisfies every node's parser without assigning tags or skipping questions
+NEUTRAL_LLM_RESPONSE = (
+    '{"assigned_tags": [], "confidence": {}, "reasoning": "test", '
+    '"needs_clarification": false, "extracted_facts": [], "inferred_facts": [], '
+    '"should_skip": false}'
+)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Make nodes created during the test use a fake LLM that always gives the neutral answer"""
+    import science.agents.nodes as nodes
+
+    monkeypatch.setattr(
+        nodes,
+        "get_llm",
+        lambda **kwargs: FakeListChatModel(responses=[NEUTRAL_LLM_RESPONSE])
+    )
+
+
+@pytest.fixture
+def workflow(fake_llm):
+    """Fresh workflow with its own in-memory sessions"""
+    from science.agents.workflow import TaxConsultationWorkflow
+
+    return TaxConsultationWorkflow()
+
+
+@pytest.fixture
+def api_client(workflow, monkeypatch):
+    """Test client for the API, served by the test's workflow"""
+    from fastapi.testclient import TestClient
+    import backend_eng.api.main as main
+
+    monkeypatch.setattr(main, "tax_workflow", workflow)
+    return TestClient(main.app)
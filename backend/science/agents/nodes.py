@@ -5,16 +5,26 @@ Owner: Science Team
 
 These nodes define the AI behavior at each phase of the consultation workflow.
 """
+import copy
+import hashlib
 import json
 import re
-from typing import Dict, Any, List, Tuple, Optional
+import traceback
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional, Union
 from pathlib import Path
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
 from science.services.llm_service import get_llm
 from science.config import science_config
-from .state import TaxConsultationState, add_message_to_state, get_conversation_context, update_state_timestamp
+from .state import TaxConsultationState, add_message_to_state, current_timestamp, get_conversation_context, update_state_timestamp
 from .prompts import (
     build_intake_system_prompt,
     build_intake_user_prompt,
@@ -24,19 +34,149 @@ from .prompts import (
     build_question_selection_prompt,
     build_multi_fact_extraction_prompt,
     build_module_relevance_prompt,
+    format_module_list,
     build_clarification_question_prompt,
     build_follow_up_question_prompt,
     build_explanation_prompt,
     build_question_relevance_prompt
 )
 
+# Extracts the outermost JSON object from an LLM response
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Module mapping from response text, in priority order
+_MODULE_KEYWORDS = {
+    "residency": "residency_elections",
+    "employment": "employment_states",
+    "business": "business_entities",
+    "real estate": "real_estate",
+    "investment": "investments_financial",
+    "pension": "pensions_savings",
+    "equity": "equity_compensation",
+    "estate": "estates_gifts_trusts",
+    "reporting": "reporting_cleanup"
+}
+_MODULE_KEYWORD_ORDER = {keyword: i for i, keyword in enumerate(_MODULE_KEYWORDS)}
+_MODULE_KEYWORD_RE = re.compile("|".join(map(re.escape, _MODULE_KEYWORDS)))
+# Phrases that mark the end of the current module
+_MODULE_COMPLETE_RE = re.compile("moving on|next topic|different area|other questions")
+
+# Affirmative replies to gating questions (substring match, like the original keyword loops)
+_AFFIRMATIVE_RE = re.compile("yes|yeah|correct|that's right|yep|sure", re.IGNORECASE)
+# The keyword tag-assignment fallback also accepts "definitely"
+_FALLBACK_AFFIRMATIVE_RE = re.compile("yes|yeah|correct|that's right|yep|sure|definitely", re.IGNORECASE)
+# Phrases that signal the user is correcting an earlier answer
+_CORRECTION_RE = re.compile(
+    "actually|wait|i meant|correction|i misspoke|that's wrong|not correct|let me correct|"
+    "i was wrong|i made a mistake|change that|i said earlier but",
+    re.IGNORECASE
+)
+
+# Knowledge base action text, e.g. "Go to Module A" / "Add tag `tag_name`"
+_MODULE_REF_RE = re.compile(r'Module ([A-I])')
+_BACKTICK_TAG_RE = re.compile(r'`([^`]+)`')
+
+# Read buffer for knowledge base files
+_KB_READ_BUFFER_SIZE = 64 * 1024
+
+# Upper bound on LLM-derived text echoed to the console
+_MAX_LOG_CHARS = 512
+
+
+def _empty_fact_extraction() -> Dict[str, Any]:
+    """Fact extraction result with nothing extracted"""
+    return {"extracted_facts": [], "inferred_facts": []}
+
+
+def _no_tags_analysis(reasoning: str) -> Dict[str, Any]:
+    """Tag analysis result that assigns no tags"""
+    return {
+        "assigned_tags": [],
+        "confidence": {},
+        "reasoning": reasoning,
+        "needs_clarification": False,
+        "clarification_question": ""
+    }
+
+
+def _truncate_for_log(value: Any) -> str:
+    """Render a value for console output, truncated so large LLM payloads aren't dumped"""
+    text = str(value)
+    if len(text) <= _MAX_LOG_CHARS:
+        return text
+    return text[:_MAX_LOG_CHARS] + "..."
+
+
+def _warn_if_truncated(response: Any, context: str) -> None:
+    """
+    Report LLM output that was cut off by the output token cap
+
+    Callers fall back to their defaults when the cut-off JSON doesn't parse, so
+    without this a truncated answer would change the flow silently.
+    """
+    finish_reason = (getattr(response, "response_metadata", None) or {}).get("finish_reason")
+    if finish_reason in ("length", "MAX_TOKENS"):
+        print(f"[WARNING] {context} hit the output token limit; consider raising it")
+
+
+def _parse_json(text: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _knowledge_base_hash(knowledge_base: Dict[str, Any]) -> str:
+    """Short content hash of the knowledge base, independent of key order"""
+    # Always stdlib json so workers with and without orjson agree on the hash
+    data = json.dumps(knowledge_base, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+@lru_cache(maxsize=32)
+def _load_json_file(path: str, mtime_ns: int) -> Any:
+    """
+    Load and parse a knowledge base JSON file, cached per process
+
+    The modification time is part of the cache key so a regenerated cache file is
+    picked up. The parsed object is shared between nodes and must not be mutated.
+    """
+    with open(path, 'rb', buffering=_KB_READ_BUFFER_SIZE) as f:
+        return _parse_json(f.read())
+
+
+def _load_knowledge_file(path: Path) -> Any:
+    """Load a knowledge base JSON file through the process-wide cache"""
+    resolved = path.resolve()
+    return _load_json_file(str(resolved), resolved.stat().st_mtime_ns)
+
 
 class BaseNode:
     """Base class for all workflow nodes"""
 
     def __init__(self):
         self.knowledge_base = self._load_knowledge_base()
-        self.llm = get_llm()
+        # Every node prompt asks for a JSON object, so request JSON output from the provider
+        self.llm = get_llm(
+            json_mode=science_config.USE_JSON_RESPONSE_MODE,
+            max_output_tokens=self._max_output_tokens(),
+            prompt_cache_key=self._prompt_cache_key()
+        )
+
+    def _max_output_tokens(self) -> int:
+        """Output token cap for this node's LLM calls"""
+        return science_config.LLM_MAX_OUTPUT_TOKENS
+
+    def _prompt_cache_key(self) -> Optional[str]:
+        """
+        Provider prompt cache key for this node's LLM calls
+
+        Prompt prefixes depend only on the node and the knowledge base, so the key
+        is the same in every process serving the same knowledge base version.
+        """
+        if not science_config.USE_PROMPT_CACHE_KEY:
+            return None
+        return f"{type(self).__name__}:{_knowledge_base_hash(self.knowledge_base)}"
 
     def _load_knowledge_base(self) -> Dict[str, Any]:
         """
@@ -45,22 +185,22 @@ class BaseNode:
         Note: Science team parses markdown files and caches JSON
         """
         try:
-            # Path points to science team's cached output
-            kb_path = Path(__file__).parent.parent / "knowledge_cache"
+            if science_config.KNOWLEDGE_BASE_DIR:
+                # Explicitly configured location (e.g. a mounted volume in deployment)
+                kb_path = Path(science_config.KNOWLEDGE_BASE_DIR)
+            else:
+                # Path points to science team's cached output
+                kb_path = Path(__file__).parent.parent / "knowledge_cache"
 
-            # Fallback to old location if new structure not ready
-            if not kb_path.exists():
-                kb_path = Path(__file__).parent.parent.parent / "data" / "knowledge_base"
+                # Fallback to old location if new structure not ready
+                if not kb_path.exists():
+                    kb_path = Path(__file__).parent.parent.parent / "data" / "knowledge_base"
 
             # Load intake questions
-            intake_path = kb_path / "intake" / "questions.json"
-            with open(intake_path, 'r', encoding='utf-8') as f:
-                intake_data = json.load(f)
+            intake_data = _load_knowledge_file(kb_path / "intake" / "questions.json")
 
             # Load tag definitions
-            tags_path = kb_path / "tags" / "definitions.json"
-            with open(tags_path, 'r', encoding='utf-8') as f:
-                tags_data = json.load(f)
+            tags_data = _load_knowledge_file(kb_path / "tags" / "definitions.json")
 
             return {
                 "intake": intake_data,
@@ -79,6 +219,18 @@ class IntakeNode(BaseNode):
         super().__init__()
         # Build module mapping dynamically from knowledge base
         self.gating_to_module_map = self._build_module_mapping()
+        # Index of every gating and module question by ID; the first definition wins,
+        # matching the previous gating-then-modules linear search
+        self._questions_by_id = self._build_question_index()
+        # Tag descriptions for multi-fact extraction, built once instead of per turn
+        tag_definitions = self.knowledge_base.get("tags", {}).get("tag_definitions", {})
+        self._all_possible_tags = [
+            {"tag_id": tag_id, "description": tag_info.get("description", "")}
+            for tag_id, tag_info in tag_definitions.items()
+        ]
+        # Module list for the relevance prompt, rendered once from the knowledge base
+        self._modules_info = self._build_modules_info()
+        self._modules_text = format_module_list(self._modules_info)
 
     def _build_module_mapping(self) -> Dict[str, str]:
         """Build mapping from gating question IDs to module names dynamically"""
@@ -106,8 +258,7 @@ class IntakeNode(BaseNode):
 
             if question_id and "Go to Module" in action:
                 # Extract module reference (e.g., "Module A")
-                import re
-                module_match = re.search(r'Module ([A-I])', action)
+                module_match = _MODULE_REF_RE.search(action)
                 if module_match:
                     module_letter = f"Module {module_match.group(1)}"
                     if module_letter in module_name_map:
@@ -115,6 +266,34 @@ class IntakeNode(BaseNode):
 
         return mapping
 
+    def _build_modules_info(self) -> List[Dict[str, str]]:
+        """Build the id/name/description summary of every module in the knowledge base"""
+        modules = self.knowledge_base.get("intake", {}).get("modules", {})
+        modules_info = []
+
+        for module_id, module_data in modules.items():
+            modules_info.append({
+                "id": module_id,
+                "name": module_data.get("name", ""),
+                "description": module_data.get("description", "Module questions")
+            })
+
+        return modules_info
+
+    def _build_question_index(self) -> Dict[str, Dict[str, Any]]:
+        """Build a lookup of question ID -> question across gating questions and all modules"""
+        intake = self.knowledge_base.get("intake", {})
+        all_questions = list(intake.get("gating_questions", {}).get("questions", []))
+        for module_data in intake.get("modules", {}).values():
+            all_questions.extend(module_data.get("questions", []))
+
+        index = {}
+        for question in all_questions:
+            question_id = question.get("id")
+            if question_id is not None:
+                index.setdefault(question_id, question)
+        return index
+
     def __call__(self, state: TaxConsultationState) -> TaxConsultationState:
         """Process intake phase"""
 
@@ -123,8 +302,11 @@ class IntakeNode(BaseNode):
             if state is None:
                 raise ValueError("IntakeNode received None state")
 
-            # Update knowledge base context in state
-            state["knowledge_base"] = self.knowledge_base
+            # One timestamp for everything recorded about the user's turn
+            turn_timestamp = current_timestamp()
+
+            # Update knowledge base context in state. The full knowledge base stays on
+            # the node: copying it into state would re-serialize it in every checkpoint.
             state["available_gating_questions"] = self.knowledge_base.get("intake", {}).get("gating_questions", {}).get("questions", [])
 
             # Phase 3: Check for correction keywords
@@ -143,74 +325,55 @@ class IntakeNode(BaseNode):
                 previous_question_id = state["asked_question_ids"][-1]
 
                 # Find the question object
-                all_questions = state["available_gating_questions"].copy()
-                modules = self.knowledge_base.get("intake", {}).get("modules", {})
-                for module_data in modules.values():
-                    all_questions.extend(module_data.get("questions", []))
-
-                previous_question = None
-                for q in all_questions:
-                    if q.get("id") == previous_question_id:
-                        previous_question = q
-                        break
-
-                if previous_question:
-                    # Use LLM or fallback based on config
-                    if science_config.USE_LLM_TAG_ASSIGNMENT:
-                        tag_analysis_result = self._analyze_response_with_llm(
-                            state["current_message"],
-                            previous_question,
-                            state
-                        )
-                    else:
-                        # Use deterministic fallback
-                        tag_analysis_result = self._analyze_response_for_tags_fallback(
-                            state["current_message"],
-                            previous_question,
-                            state
-                        )
-
-                    # Phase 3: Check if clarification is needed
-                    if (science_config.USE_AUTO_CLARIFICATION and
-                        tag_analysis_result.get("needs_clarification", False)):
-                        # Enter clarification mode
-                        state["clarification_mode"] = True
-                        state["clarification_context"] = {
-                            "original_question_id": previous_question_id,
-                            "original_response": state["current_message"],
-                            "clarification_question": tag_analysis_result.get("clarification_question", ""),
-                            "pending_tags": tag_analysis_result.get("assigned_tags", []),
-                            "reasoning": tag_analysis_result.get("reasoning", "")
-                        }
-                        # Don't assign tags yet - wait for clarification
-                    else:
-                        # Update assigned tags with confidence tracking
-                        from datetime import datetime
-                        for tag in tag_analysis_result.get("assigned_tags", []):
-                            if tag not in state["assigned_tags"]:
-                                state["assigned_tags"].append(tag)
-
-                                # Track confidence
-                                confidence = tag_analysis_result.get("confidence", {}).get(tag, "medium")
-                                state["tag_confidence"][tag] = confidence
-
-                                # Track reasoning for audit trail
-                                state["tag_assignment_reasoning"][tag] = {
-                                    "question_id": previous_question_id,
-                                    "user_response": state["current_message"],
-                                    "confidence": confidence,
-                                    "reasoning": tag_analysis_result.get("reasoning", ""),
-                                    "timestamp": datetime.now().isoformat()
-                                }
-
-            # Phase 3: Multi-fact extraction - extract ALL facts from response
-            if state["current_message"] and science_config.USE_MULTI_FACT_EXTRACTION:
-                extraction_result = self._extract_all_facts_from_response(
+                previous_question = self._questions_by_id.get(previous_question_id)
+
+            # Run tag analysis and multi-fact extraction for this response
+            extraction_result = None
+            if state["current_message"]:
+                tag_analysis_result, extraction_result = self._analyze_user_response(
                     state["current_message"],
+                    previous_question,
                     state
                 )
-                # Apply extracted facts with confidence tracking
-                state = self._apply_extracted_facts(state, extraction_result)
+
+            if previous_question and tag_analysis_result:
+                # Phase 3: Check if clarification is needed
+                if (science_config.USE_AUTO_CLARIFICATION and
+                    tag_analysis_result.get("needs_clarification", False)):
+                    # Enter clarification mode
+                    state["clarification_mode"] = True
+                    state["clarification_context"] = {
+                        "original_question_id": previous_question_id,
+                        "original_response": state["current_message"],
+                        "clarification_question": tag_analysis_result.get("clarification_question", ""),
+                        "pending_tags": tag_analysis_result.get("assigned_tags", []),
+                        "reasoning": tag_analysis_result.get("reasoning", "")
+                    }
+                    # Don't assign tags yet - wait for clarification
+                else:
+                    # Update assigned tags with confidence tracking
+                    assigned = set(state["assigned_tags"])
+                    for tag in tag_analysis_result.get("assigned_tags", []):
+                        if tag not in assigned:
+                            assigned.add(tag)
+                            state["assigned_tags"].append(tag)
+
+                            # Track confidence
+                            confidence = tag_analysis_result.get("confidence", {}).get(tag, "medium")
+                            state["tag_confidence"][tag] = confidence
+
+                            # Track reasoning for audit trail
+                            state["tag_assignment_reasoning"][tag] = {
+                                "question_id": previous_question_id,
+                                "user_response": state["current_message"],
+                                "confidence": confidence,
+                                "reasoning": tag_analysis_result.get("reasoning", ""),
+                                "timestamp": turn_timestamp
+                            }
+
+            # Phase 3: Apply facts from multi-fact extraction with confidence tracking
+            if extraction_result is not None:
+                state = self._apply_extracted_facts(state, extraction_result, turn_timestamp)
 
             # Phase 3: Check if we need adaptive follow-up
             if (science_config.USE_ADAPTIVE_FOLLOWUPS and
@@ -241,7 +404,7 @@ class IntakeNode(BaseNode):
 
             # Add user message to conversation
             if state["current_message"]:
-                state = add_message_to_state(state, "user", state["current_message"])
+                state = add_message_to_state(state, "user", state["current_message"], turn_timestamp)
 
             # Generate assistant response (ask next question)
             response, quick_replies = self._generate_next_question(state)
@@ -251,7 +414,8 @@ class IntakeNode(BaseNode):
             state["quick_replies"] = quick_replies
 
             # Add assistant message to conversation
-            state = add_message_to_state(state, "assistant", response)
+            response_timestamp = current_timestamp()
+            state = add_message_to_state(state, "assistant", response, response_timestamp)
 
             # Update module progression
             state = self._update_module_progression(state, response)
@@ -263,13 +427,12 @@ class IntakeNode(BaseNode):
             if not state.get("should_transition", False):
                 state["current_phase"] = "intake"
 
-            state = update_state_timestamp(state)
+            state = update_state_timestamp(state, response_timestamp)
 
             return state
 
         except Exception as e:
             # Handle error - check if state exists
-            import traceback
             print(f"[ERROR] IntakeNode exception: {str(e)}")
             print(f"[ERROR] Traceback: {traceback.format_exc()}")
             if state is None:
@@ -334,8 +497,9 @@ class IntakeNode(BaseNode):
         quick_replies = next_question.get("quick_replies", ["Yes", "No"])
 
         # Phase 3: Add explanation if enabled
-        if science_config.USE_EXPLANATION_GENERATION and len(state["messages"]) > 2:
-            explanation = self._generate_question_explanation(
+        if self._wants_explanation(state):
+            # Reuse the explanation from the relevance check when there was one
+            explanation = next_question.get("explanation") or self._generate_question_explanation(
                 question_text,
                 state
             )
@@ -355,103 +519,24 @@ class IntakeNode(BaseNode):
         question_text, quick_replies = self._generate_next_question(state)
         return question_text, quick_replies, []  # Tags now handled separately
 
-    def _parse_response(self, response: str) -> Tuple[str, List[str], List[str]]:
-        """Parse LLM response to extract tags and quick replies"""
-
-        # Extract assigned tags
-        tags_match = re.search(r'ASSIGNED_TAGS:\s*\[(.*?)\]', response, re.IGNORECASE | re.DOTALL)
-        assigned_tags = []
-        if tags_match:
-            tags_str = tags_match.group(1)
-            try:
-                tags_str = f"[{tags_str}]"
-                assigned_tags = json.loads(tags_str)
-            except:
-                assigned_tags = [tag.strip().strip('"\'') for tag in tags_str.split(',') if tag.strip()]
-
-        # Extract quick replies
-        quick_replies_match = re.search(r'QUICK_REPLIES:\s*\[(.*?)\]', response, re.IGNORECASE | re.DOTALL)
-        quick_replies = []
-        if quick_replies_match:
-            replies_str = quick_replies_match.group(1)
-            try:
-                replies_str = f"[{replies_str}]"
-                quick_replies = json.loads(replies_str)
-            except:
-                quick_replies = [reply.strip().strip('"\'') for reply in replies_str.split(',') if reply.strip()]
-
-        # Clean response by removing the extracted parts
-        clean_response = response
-        if tags_match:
-            clean_response = clean_response.replace(tags_match.group(0), '').strip()
-        if quick_replies_match:
-            clean_response = clean_response.replace(quick_replies_match.group(0), '').strip()
-
-        return clean_response, assigned_tags, quick_replies
-
-    def _has_multiple_questions(self, response: str) -> bool:
-        """Check if response has multiple questions"""
-        question_count = response.count('?')
-        numbered_lists = len([line for line in response.split('\n') if re.match(r'^\s*\d+\.', line)])
-        return question_count > 1 or numbered_lists > 1
-
-    def _fix_multiple_questions(self, response: str, state: TaxConsultationState) -> str:
-        """Fix responses with multiple questions by extracting appropriate single question"""
-
-        current_module = state["current_module"]
-
-        if not current_module:
-            # Should be asking gating questions
-            gating_questions = state["available_gating_questions"]
-            for gating_q in gating_questions:
-                question_text = gating_q["question"]
-                if question_text.lower() in response.lower():
-                    return question_text
-            # Default to first gating question
-            if gating_questions:
-                return gating_questions[0]["question"]
-
-        # Extract first reasonable question
-        lines = response.split('\n')
-        for line in lines:
-            line = line.strip()
-            if '?' in line and not line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.')):
-                line = re.sub(r'^\d+\.\s*', '', line)
-                line = re.sub(r'^[•\-]\s*', '', line)
-                if len(line) > 10:
-                    return line
-
-        # Fallback
-        return "Are you a U.S. citizen or U.S. green-card holder?"
-
     def _update_module_progression(self, state: TaxConsultationState, agent_response: str) -> TaxConsultationState:
         """Update module progression based on conversation flow"""
 
         agent_lower = agent_response.lower()
 
-        # Module mapping from response text
-        module_mappings = {
-            "residency": "residency_elections",
-            "employment": "employment_states",
-            "business": "business_entities",
-            "real estate": "real_estate",
-            "investment": "investments_financial",
-            "pension": "pensions_savings",
-            "equity": "equity_compensation",
-            "estate": "estates_gifts_trusts",
-            "reporting": "reporting_cleanup"
-        }
-
         # Check if transitioning to a module
-        for keyword, module_id in module_mappings.items():
-            if keyword in agent_lower and ("module" in agent_lower or "questions about" in agent_lower):
+        if "module" in agent_lower or "questions about" in agent_lower:
+            # All module keywords in one scan; the earliest keyword in mapping order wins
+            found = set(_MODULE_KEYWORD_RE.findall(agent_lower))
+            if found:
+                keyword = min(found, key=_MODULE_KEYWORD_ORDER.__getitem__)
+                module_id = _MODULE_KEYWORDS[keyword]
                 if module_id not in state["completed_modules"]:
                     state["current_module"] = module_id
-                break
 
         # Check if module is complete
         if state["current_module"]:
-            if any(phrase in agent_lower for phrase in ["moving on", "next topic", "different area", "other questions"]):
+            if _MODULE_COMPLETE_RE.search(agent_lower):
                 completed_module = state["current_module"]
                 if completed_module not in state["completed_modules"]:
                     state["completed_modules"].append(completed_module)
@@ -548,15 +633,15 @@ class IntakeNode(BaseNode):
         )
 
         # Call LLM
-        from langchain_core.messages import HumanMessage
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
+            _warn_if_truncated(response, "Question selection")
             content = response.content
 
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
 
                 # Check if ready for transition
                 if result.get("ready_for_transition", False):
@@ -567,19 +652,22 @@ class IntakeNode(BaseNode):
                 # Get selected question ID
                 selected_id = result.get("selected_question_id")
                 if selected_id:
-                    # Find the question object
-                    for q in available_questions:
-                        if q.get("id") == selected_id:
-                            # Mark skipped questions
-                            skip_ids = result.get("skip_questions", [])
-                            for skip_id in skip_ids:
-                                if skip_id not in state["skipped_question_ids"]:
-                                    state["skipped_question_ids"].append(skip_id)
-
-                            return q
+                    # Find the question object; it must still be available (not asked or skipped)
+                    q = self._questions_by_id.get(selected_id)
+                    if (q is not None and
+                            selected_id not in state["asked_question_ids"] and
+                            selected_id not in state["skipped_question_ids"]):
+                        # Mark skipped questions
+                        skipped_ids = set(state["skipped_question_ids"])
+                        for skip_id in result.get("skip_questions", []):
+                            if skip_id not in skipped_ids:
+                                skipped_ids.add(skip_id)
+                                state["skipped_question_ids"].append(skip_id)
+
+                        return q
 
         except Exception as e:
-            print(f"LLM question selection error: {e}")
+            print(f"LLM question selection error: {_truncate_for_log(e)}")
             # Fallback to deterministic selection
             return self._select_next_question_deterministic(state)
 
@@ -645,20 +733,10 @@ class IntakeNode(BaseNode):
     def _select_next_gating_question(self, state: TaxConsultationState) -> Optional[Dict[str, Any]]:
         """Select next gating question that hasn't been asked"""
 
-        gating_questions = state["available_gating_questions"]
-        asked_ids = state["asked_question_ids"]
-
-        # Find first unasked gating question
-        for question in gating_questions:
-            question_id = question.get("id")
-            if question_id and question_id not in asked_ids:
-                # Check if we should skip this question based on context
-                if not self._should_skip_question(question, state):
-                    return question
-                else:
-                    # Mark as skipped
-                    if question_id not in state["skipped_question_ids"]:
-                        state["skipped_question_ids"].append(question_id)
+        # Find first unasked gating question that should not be skipped
+        question = self._first_unskipped_question(state["available_gating_questions"], state)
+        if question:
+            return question
 
         # All gating questions have been asked/skipped
         # Now check if we should enter any modules based on yes responses
@@ -681,20 +759,10 @@ class IntakeNode(BaseNode):
         if current_module not in modules:
             return None
 
-        module_questions = modules[current_module].get("questions", [])
-        asked_ids = state["asked_question_ids"]
-
-        # Find first unasked module question
-        for question in module_questions:
-            question_id = question.get("id")
-            if question_id and question_id not in asked_ids:
-                # Check if we should skip this question based on context
-                if not self._should_skip_question(question, state):
-                    return question
-                else:
-                    # Mark as skipped
-                    if question_id not in state["skipped_question_ids"]:
-                        state["skipped_question_ids"].append(question_id)
+        # Find first unasked module question that should not be skipped
+        question = self._first_unskipped_question(modules[current_module].get("questions", []), state)
+        if question:
+            return question
 
         # All questions in this module have been asked/skipped
         # Mark module as completed and look for next module
@@ -711,13 +779,62 @@ class IntakeNode(BaseNode):
         # No more questions
         return None
 
-    def _should_skip_question(self, question: Dict[str, Any], state: TaxConsultationState) -> bool:
+    def _first_unskipped_question(
+        self,
+        questions: List[Dict[str, Any]],
+        state: TaxConsultationState
+    ) -> Optional[Dict[str, Any]]:
         """
-        Determine if a question should be skipped using LLM-based intelligent analysis.
-
-        Replaces rule-based skipping which was too aggressive and caused issues
-        with cross-border situations (e.g., Canadian PR with US RSU income).
+        Return the first unasked question that should not be skipped
+
+        Questions judged skippable along the way are recorded in
+        skipped_question_ids. When LLM skipping is active, the first candidate is
+        checked on its own, since it is usually the one asked; once a candidate has
+        been skipped, the checks for the next SKIP_CHECK_BATCH_SIZE candidates run
+        concurrently and decisions after the selected one are discarded.
+
+        If an explanation is wanted for this turn, a check made on its own also
+        writes it, and it is attached to the returned question under
+        "explanation". Batched checks don't ask for one, since most of those
+        candidates are never shown.
         """
+        asked_ids = set(state["asked_question_ids"])
+        skipped_ids = set(state["skipped_question_ids"])
+        candidates = [q for q in questions if q.get("id") and q.get("id") not in asked_ids]
+
+        checks_active = self._skip_checks_active(state)
+        include_explanation = checks_active and self._wants_explanation(state)
+        start = 0
+        batch_size = 1
+
+        while start < len(candidates):
+            batch = candidates[start:start + batch_size]
+            start += len(batch)
+            if checks_active:
+                checks = self._check_questions_with_llm(batch, state, include_explanation and len(batch) == 1)
+            else:
+                checks = [(False, None)] * len(batch)
+
+            for question, (should_skip, explanation) in zip(batch, checks, strict=True):
+                # Check if we should skip this question based on context
+                if not should_skip:
+                    if explanation:
+                        return {**question, "explanation": explanation}
+                    return question
+                # Mark as skipped
+                question_id = question["id"]
+                if question_id not in skipped_ids:
+                    skipped_ids.add(question_id)
+                    state["skipped_question_ids"].append(question_id)
+
+            # A skip makes further skips likely, so check ahead from here on
+            if checks_active:
+                batch_size = max(1, science_config.SKIP_CHECK_BATCH_SIZE)
+
+        return None
+
+    def _skip_checks_active(self, state: TaxConsultationState) -> bool:
+        """Whether questions can be skipped at this point in the conversation"""
         # CRITICAL: Never skip questions at the start of conversation
         # We need to establish baseline information before intelligent skipping
         questions_asked = len(state.get("asked_question_ids", []))
@@ -725,8 +842,20 @@ class IntakeNode(BaseNode):
             return False  # Always ask first N questions to establish context
 
         # Check if LLM-based skipping is enabled
-        if not science_config.USE_LLM_QUESTION_SKIPPING:
-            # Disabled - never skip questions
+        return science_config.USE_LLM_QUESTION_SKIPPING
+
+    def _wants_explanation(self, state: TaxConsultationState) -> bool:
+        """Whether the next question should be prefixed with an explanation"""
+        return science_config.USE_EXPLANATION_GENERATION and len(state["messages"]) > 2
+
+    def _should_skip_question(self, question: Dict[str, Any], state: TaxConsultationState) -> bool:
+        """
+        Determine if a question should be skipped using LLM-based intelligent analysis.
+
+        Replaces rule-based skipping which was too aggressive and caused issues
+        with cross-border situations (e.g., Canadian PR with US RSU income).
+        """
+        if not self._skip_checks_active(state):
             return False
 
         # Use LLM to intelligently determine relevance
@@ -747,60 +876,93 @@ class IntakeNode(BaseNode):
         Returns:
             True if question should be skipped, False otherwise
         """
-        from langchain_core.messages import HumanMessage
+        return self._check_questions_with_llm([question], state)[0][0]
 
+    def _check_questions_with_llm(
+        self,
+        questions: List[Dict[str, Any]],
+        state: TaxConsultationState,
+        include_explanation: bool = False
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Run the LLM relevance check for several questions at once
+
+        The checks are independent of each other, so their requests are sent
+        together in one batch and run concurrently. With include_explanation,
+        each check also writes the explanation shown before the question, so no
+        separate explanation call is needed for the question that gets asked.
+
+        Returns:
+            One (should_skip, explanation) pair per question, in order
+        """
         try:
             # Get conversation context
             conversation_context = get_conversation_context(state, last_n=15)
 
-            # Get asked questions list
-            asked_question_ids = state.get("asked_question_ids", [])
-
             # Build list of asked question texts for context
             asked_questions = []
-            all_available = state.get("available_gating_questions", [])
-            modules = self.knowledge_base.get("intake", {}).get("modules", {})
-            for module_data in modules.values():
-                all_available.extend(module_data.get("questions", []))
-
-            for qid in asked_question_ids[-5:]:  # Last 5 questions
-                for q in all_available:
-                    if q.get("id") == qid:
-                        asked_questions.append(q.get("question", ""))
-                        break
-
-            # Build prompt
-            prompt = build_question_relevance_prompt(
-                question=question,
-                conversation_summary=conversation_context,
-                assigned_tags=state.get("assigned_tags", []),
-                asked_questions=asked_questions
-            )
+            for qid in state.get("asked_question_ids", [])[-5:]:  # Last 5 questions
+                q = self._questions_by_id.get(qid)
+                if q is not None:
+                    asked_questions.append(q.get("question", ""))
+
+            requests = [
+                [HumanMessage(content=build_question_relevance_prompt(
+                    question=question,
+                    conversation_summary=conversation_context,
+                    assigned_tags=state.get("assigned_tags", []),
+                    asked_questions=asked_questions,
+                    include_explanation=include_explanation
+                ))]
+                for question in questions
+            ]
 
             # Call LLM
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            content = response.content
+            responses = self.llm.batch(requests, return_exceptions=True)
 
+        except Exception as e:
+            print(f"[WARNING] LLM question relevance check failed: {_truncate_for_log(e)}")
+            # Safe fallback: don't skip if LLM fails
+            return [(False, None)] * len(questions)
+
+        if len(responses) != len(questions):
+            print(f"[WARNING] LLM question relevance check returned {len(responses)} results for {len(questions)} questions")
+            return [(False, None)] * len(questions)
+
+        return [
+            self._parse_relevance_check(response, question)
+            for question, response in zip(questions, responses, strict=True)
+        ]
+
+    def _parse_relevance_check(self, response: Any, question: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Parse one relevance check response; anything unexpected means don't skip"""
+
+        if isinstance(response, Exception):
+            print(f"[WARNING] LLM question relevance check failed: {_truncate_for_log(response)}")
+            return False, None
+
+        _warn_if_truncated(response, "Question relevance check")
+        try:
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(response.content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
                 should_skip = result.get("should_skip", False)
                 reasoning = result.get("reasoning", "")
 
                 # Log the decision for debugging
-                if should_skip:
-                    print(f"[LLM SKIP] Skipping question '{question.get('id')}': {reasoning}")
+                if should_skip and science_config.DEBUG_LOGGING:
+                    print(f"[LLM SKIP] Skipping question '{question.get('id')}': {_truncate_for_log(reasoning)}")
 
-                return should_skip
+                return should_skip, result.get("explanation") or None
 
         except Exception as e:
-            print(f"[WARNING] LLM question relevance check failed: {e}")
+            print(f"[WARNING] LLM question relevance check failed: {_truncate_for_log(e)}")
             # Safe fallback: don't skip if LLM fails
-            return False
+            return False, None
 
         # Default: don't skip
-        return False
+        return False, None
 
     def _get_triggered_module(self, state: TaxConsultationState) -> Optional[str]:
         """
@@ -822,20 +984,19 @@ class IntakeNode(BaseNode):
                 # Try to find which question this was
                 if i // 2 < len(asked_ids):
                     question_id = asked_ids[i // 2]
-                    user_response = messages[i+1]["content"].lower()
+                    user_response = messages[i+1]["content"]
                     question_response_pairs.append((question_id, user_response))
 
         # Check which gating questions got affirmative responses
-        affirmative_indicators = ["yes", "yeah", "correct", "that's right", "yep", "sure"]
+        unavailable_modules = set(state["completed_modules"]) | set(state["skipped_modules"])
 
         for question_id, user_response in question_response_pairs:
             # Use dynamically built mapping
             if question_id in self.gating_to_module_map:
-                is_affirmative = any(indicator in user_response for indicator in affirmative_indicators)
-                if is_affirmative:
+                if _AFFIRMATIVE_RE.search(user_response):
                     module = self.gating_to_module_map[question_id]
                     # Phase 3: Check if module is skipped
-                    if module not in state["completed_modules"] and module not in state["skipped_modules"]:
+                    if module not in unavailable_modules:
                         return module
 
         return None
@@ -846,6 +1007,62 @@ class IntakeNode(BaseNode):
         # Similar logic to _get_triggered_module but excludes completed modules
         return self._get_triggered_module(state)
 
+    def _analyze_user_response(
+        self,
+        user_response: str,
+        previous_question: Optional[Dict[str, Any]],
+        state: TaxConsultationState
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Run tag analysis and multi-fact extraction for a user response
+
+        Both analyses only depend on the response and the conversation so far,
+        so their LLM requests are sent together in a single batch instead of
+        one round-trip after the other.
+
+        Returns:
+            Tuple of (tag analysis result, extraction result); either is None
+            when that analysis does not apply to this turn
+        """
+        requests = []
+        run_tag_analysis = previous_question is not None and science_config.USE_LLM_TAG_ASSIGNMENT
+        run_extraction = science_config.USE_MULTI_FACT_EXTRACTION
+
+        # Both prompts embed the same recent conversation; render it once
+        conversation_context = get_conversation_context(state, last_n=10) if run_tag_analysis or run_extraction else ""
+
+        if run_tag_analysis:
+            requests.append(self._build_tag_analysis_messages(user_response, previous_question, state, conversation_context))
+        if run_extraction:
+            requests.append(self._build_fact_extraction_messages(user_response, state, conversation_context))
+
+        responses = self.llm.batch(requests, return_exceptions=True) if requests else []
+
+        tag_analysis_result = None
+        if run_tag_analysis:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                print(f"LLM tag analysis error: {_truncate_for_log(response)}")
+                tag_analysis_result = self._analyze_response_for_tags_fallback(user_response, previous_question, state)
+            else:
+                _warn_if_truncated(response, "Tag analysis")
+                tag_analysis_result = self._parse_tag_analysis(response.content, user_response, previous_question, state)
+        elif previous_question is not None:
+            # Use deterministic fallback
+            tag_analysis_result = self._analyze_response_for_tags_fallback(user_response, previous_question, state)
+
+        extraction_result = None
+        if run_extraction:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                print(f"Multi-fact extraction error: {_truncate_for_log(response)}")
+                extraction_result = _empty_fact_extraction()
+            else:
+                _warn_if_truncated(response, "Multi-fact extraction")
+                extraction_result = self._parse_fact_extraction(response.content)
+
+        return tag_analysis_result, extraction_result
+
     def _analyze_response_with_llm(
         self,
         user_response: str,
@@ -862,8 +1079,29 @@ class IntakeNode(BaseNode):
         - needs_clarification: bool
         """
 
-        # Get conversation context
-        conversation_context = get_conversation_context(state, last_n=10)
+        # Call LLM
+        try:
+            response = self.llm.invoke(self._build_tag_analysis_messages(user_response, previous_question, state))
+        except Exception as e:
+            print(f"LLM tag analysis error: {_truncate_for_log(e)}")
+            # Fallback to keyword-based approach
+            return self._analyze_response_for_tags_fallback(user_response, previous_question, state)
+
+        _warn_if_truncated(response, "Tag analysis")
+        return self._parse_tag_analysis(response.content, user_response, previous_question, state)
+
+    def _build_tag_analysis_messages(
+        self,
+        user_response: str,
+        previous_question: Dict[str, Any],
+        state: TaxConsultationState,
+        conversation_context: Optional[str] = None
+    ) -> List[HumanMessage]:
+        """Build LLM messages for analyzing a response to the previous question"""
+
+        # Get conversation context (unless the caller already rendered it)
+        if conversation_context is None:
+            conversation_context = get_conversation_context(state, last_n=10)
 
         # Build prompt
         prompt = build_tag_analysis_prompt(
@@ -872,20 +1110,26 @@ class IntakeNode(BaseNode):
             conversation_history=conversation_context
         )
 
-        # Call LLM
-        from langchain_core.messages import HumanMessage
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            content = response.content
+        return [HumanMessage(content=prompt)]
 
+    def _parse_tag_analysis(
+        self,
+        content: str,
+        user_response: str,
+        previous_question: Dict[str, Any],
+        state: TaxConsultationState
+    ) -> Dict[str, Any]:
+        """Parse LLM tag analysis output, falling back to keyword matching on failure"""
+
+        try:
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
 
                 # Validate assigned tags exist in question action
                 action = previous_question.get("action", "")
-                possible_tags = re.findall(r'`([^`]+)`', action)
+                possible_tags = _BACKTICK_TAG_RE.findall(action)
 
                 # Filter to only tags mentioned in the question
                 validated_tags = [
@@ -902,7 +1146,7 @@ class IntakeNode(BaseNode):
                 }
 
         except Exception as e:
-            print(f"LLM tag analysis error: {e}")
+            print(f"LLM tag analysis error: {_truncate_for_log(e)}")
             # Fallback to keyword-based approach
             return self._analyze_response_for_tags_fallback(user_response, previous_question, state)
 
@@ -921,25 +1165,14 @@ class IntakeNode(BaseNode):
         """
 
         # Check if user gave an affirmative response
-        user_response_lower = user_response.lower()
-        affirmative_indicators = ["yes", "yeah", "correct", "that's right", "yep", "sure", "definitely"]
-
-        is_affirmative = any(indicator in user_response_lower for indicator in affirmative_indicators)
-
-        if not is_affirmative:
-            return {
-                "assigned_tags": [],
-                "confidence": {},
-                "reasoning": "Response was not affirmative",
-                "needs_clarification": False,
-                "clarification_question": ""
-            }
+        if not _FALLBACK_AFFIRMATIVE_RE.search(user_response):
+            return _no_tags_analysis("Response was not affirmative")
 
         # Extract tag from action
         action = previous_question.get("action", "")
         if "add tag" in action.lower():
             # Extract tag name from action like "Add tag `tag_name`"
-            tag_match = re.search(r'`([^`]+)`', action)
+            tag_match = _BACKTICK_TAG_RE.search(action)
             if tag_match:
                 tag = tag_match.group(1)
                 if tag not in state["assigned_tags"]:
@@ -951,13 +1184,7 @@ class IntakeNode(BaseNode):
                         "clarification_question": ""
                     }
 
-        return {
-            "assigned_tags": [],
-            "confidence": {},
-            "reasoning": "No tags to assign",
-            "needs_clarification": False,
-            "clarification_question": ""
-        }
+        return _no_tags_analysis("No tags to assign")
 
     def _analyze_response_for_tags(
         self,
@@ -974,19 +1201,7 @@ class IntakeNode(BaseNode):
             return []
 
         # Find the question that was asked
-        all_questions = state["available_gating_questions"].copy()
-
-        # Add module questions
-        modules = self.knowledge_base.get("intake", {}).get("modules", {})
-        for module_data in modules.values():
-            all_questions.extend(module_data.get("questions", []))
-
-        # Find the previous question
-        previous_question = None
-        for q in all_questions:
-            if q.get("id") == previous_question_id:
-                previous_question = q
-                break
+        previous_question = self._questions_by_id.get(previous_question_id)
 
         if not previous_question:
             return []
@@ -1004,51 +1219,67 @@ class IntakeNode(BaseNode):
         """
 
         if not science_config.USE_MULTI_FACT_EXTRACTION:
-            return {"extracted_facts": [], "inferred_facts": []}
+            return _empty_fact_extraction()
 
-        # Get all possible tags with descriptions
-        tag_definitions = self.knowledge_base.get("tags", {}).get("tag_definitions", {})
-        all_possible_tags = []
-        for tag_id, tag_info in tag_definitions.items():
-            all_possible_tags.append({
-                "tag_id": tag_id,
-                "description": tag_info.get("description", "")
-            })
+        # Call LLM
+        try:
+            response = self.llm.invoke(self._build_fact_extraction_messages(user_response, state))
+        except Exception as e:
+            print(f"Multi-fact extraction error: {_truncate_for_log(e)}")
+            return _empty_fact_extraction()
+
+        _warn_if_truncated(response, "Multi-fact extraction")
+        return self._parse_fact_extraction(response.content)
+
+    def _build_fact_extraction_messages(
+        self,
+        user_response: str,
+        state: TaxConsultationState,
+        conversation_history: Optional[str] = None
+    ) -> List[HumanMessage]:
+        """Build LLM messages for multi-fact extraction"""
 
-        # Get conversation history
-        conversation_history = get_conversation_context(state, last_n=10)
+        # Get conversation history (unless the caller already rendered it)
+        if conversation_history is None:
+            conversation_history = get_conversation_context(state, last_n=10)
 
         # Build prompt
         prompt = build_multi_fact_extraction_prompt(
             user_response=user_response,
             conversation_history=conversation_history,
-            all_possible_tags=all_possible_tags
+            all_possible_tags=self._all_possible_tags
         )
 
-        # Call LLM
-        from langchain_core.messages import HumanMessage
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            content = response.content
+        return [HumanMessage(content=prompt)]
 
+    def _parse_fact_extraction(self, content: str) -> Dict[str, Any]:
+        """Parse LLM multi-fact extraction output"""
+
+        try:
             # Parse JSON
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
                 return result
 
         except Exception as e:
-            print(f"Multi-fact extraction error: {e}")
+            print(f"Multi-fact extraction error: {_truncate_for_log(e)}")
 
-        return {"extracted_facts": [], "inferred_facts": []}
+        return _empty_fact_extraction()
 
-    def _apply_extracted_facts(self, state: TaxConsultationState, extraction_result: Dict[str, Any]):
+    def _apply_extracted_facts(
+        self,
+        state: TaxConsultationState,
+        extraction_result: Dict[str, Any],
+        timestamp: Optional[str] = None
+    ):
         """
         Apply the facts extracted from multi-fact extraction to state
 
         This assigns tags found in the user's response even if not directly asked
         """
-        from datetime import datetime
+        now = timestamp or current_timestamp()
+        assigned = set(state["assigned_tags"])
 
         # Process explicit facts (high confidence)
         for fact in extraction_result.get("extracted_facts", []):
@@ -1057,7 +1288,8 @@ class IntakeNode(BaseNode):
             evidence = fact.get("evidence", "")
 
             for tag in tags:
-                if tag not in state["assigned_tags"]:
+                if tag not in assigned:
+                    assigned.add(tag)
                     state["assigned_tags"].append(tag)
                     state["tag_confidence"][tag] = confidence
                     state["tag_assignment_reasoning"][tag] = {
@@ -1065,7 +1297,7 @@ class IntakeNode(BaseNode):
                         "fact": fact.get("fact", ""),
                         "evidence": evidence,
                         "confidence": confidence,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now
                     }
 
                     # Store in extracted facts for audit
@@ -1078,10 +1310,11 @@ class IntakeNode(BaseNode):
             evidence = fact.get("evidence", "")
 
             for tag in tags:
-                if tag not in state["assigned_tags"]:
+                if tag not in assigned:
                     # For inferred facts, only add to verification_needed
                     # Don't assign immediately unless high confidence
                     if confidence == "high":
+                        assigned.add(tag)
                         state["assigned_tags"].append(tag)
                         state["tag_confidence"][tag] = confidence
                         state["tag_assignment_reasoning"][tag] = {
@@ -1089,7 +1322,7 @@ class IntakeNode(BaseNode):
                             "fact": fact.get("fact", ""),
                             "evidence": evidence,
                             "confidence": confidence,
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": now
                         }
                     else:
                         # Add to verification list
@@ -1098,7 +1331,7 @@ class IntakeNode(BaseNode):
                             "fact": fact.get("fact", ""),
                             "confidence": confidence,
                             "evidence": evidence,
-                            "added_at": datetime.now().isoformat()
+                            "added_at": now
                         })
 
         return state
@@ -1118,37 +1351,28 @@ class IntakeNode(BaseNode):
         conversation_context = get_conversation_context(state, last_n=10)
         initial_response = state["messages"][0]["content"] if state["messages"] else ""
 
-        # Get all available modules
-        modules = self.knowledge_base.get("intake", {}).get("modules", {})
-        modules_info = []
-
-        for module_id, module_data in modules.items():
-            modules_info.append({
-                "id": module_id,
-                "name": module_data.get("name", ""),
-                "description": module_data.get("description", "Module questions")
-            })
-
         # Build prompt
         prompt = build_module_relevance_prompt(
             initial_response=initial_response,
             conversation_summary=conversation_context,
-            modules=modules_info
+            modules=self._modules_info,
+            modules_text=self._modules_text
         )
 
         # Call LLM
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
+            _warn_if_truncated(response, "Module relevance analysis")
             content = response.content
 
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
                 return result
 
         except Exception as e:
-            print(f"Module relevance analysis error: {e}")
+            print(f"Module relevance analysis error: {_truncate_for_log(e)}")
 
         # Fallback: all modules relevant
         return {"relevant_modules": [], "skip_modules": [], "verify_modules": []}
@@ -1168,7 +1392,8 @@ class IntakeNode(BaseNode):
                 state["skipped_modules"].append(module_id)
 
                 # Log the decision
-                print(f"[SMART SKIP] Skipping module {module_id}: {reasoning}")
+                if science_config.DEBUG_LOGGING:
+                    print(f"[SMART SKIP] Skipping module {module_id}: {_truncate_for_log(reasoning)}")
 
         return state
 
@@ -1196,16 +1421,17 @@ class IntakeNode(BaseNode):
         # Call LLM
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
+            _warn_if_truncated(response, "Question explanation")
             content = response.content
 
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
                 return result.get("combined", "")
 
         except Exception as e:
-            print(f"Explanation generation error: {e}")
+            print(f"Explanation generation error: {_truncate_for_log(e)}")
 
         return None
 
@@ -1238,16 +1464,17 @@ class IntakeNode(BaseNode):
         # Call LLM
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
+            _warn_if_truncated(response, "Follow-up check")
             content = response.content
 
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
                 return result
 
         except Exception as e:
-            print(f"Follow-up check error: {e}")
+            print(f"Follow-up check error: {_truncate_for_log(e)}")
 
         return {"needs_followup": False}
 
@@ -1279,14 +1506,7 @@ class IntakeNode(BaseNode):
         Detect if user is trying to correct a previous answer
         """
 
-        correction_keywords = [
-            "actually", "wait", "i meant", "correction", "i misspoke",
-            "that's wrong", "not correct", "let me correct", "i was wrong",
-            "i made a mistake", "change that", "i said earlier but"
-        ]
-
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in correction_keywords)
+        return _CORRECTION_RE.search(message) is not None
 
     def _handle_correction(self, message: str, state: TaxConsultationState) -> TaxConsultationState:
         """
@@ -1295,12 +1515,11 @@ class IntakeNode(BaseNode):
         Handle user correction - analyze what they're correcting and update state
         """
 
-        from datetime import datetime
-
         # Log the correction
+        now = current_timestamp()
         correction_entry = {
             "message": message,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
             "conversation_turn": len(state["messages"])
         }
 
@@ -1331,12 +1550,13 @@ Analyze what the user is correcting and respond in JSON format:
 
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
+            _warn_if_truncated(response, "Correction handling")
             content = response.content
 
             # Parse JSON response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(0))
+                result = _parse_json(json_match.group(0))
 
                 # Remove tags
                 for tag in result.get("tags_to_remove", []):
@@ -1351,8 +1571,10 @@ Analyze what the user is correcting and respond in JSON format:
                 correction_entry["reasoning"] = result.get("reasoning", "")
 
                 # Add tags
+                assigned = set(state["assigned_tags"])
                 for tag in result.get("tags_to_add", []):
-                    if tag not in state["assigned_tags"]:
+                    if tag not in assigned:
+                        assigned.add(tag)
                         state["assigned_tags"].append(tag)
                         state["tag_confidence"][tag] = result.get("confidence", "high")
                         state["tag_assignment_reasoning"][tag] = {
@@ -1360,15 +1582,19 @@ Analyze what the user is correcting and respond in JSON format:
                             "user_response": message,
                             "confidence": result.get("confidence", "high"),
                             "reasoning": result.get("reasoning", ""),
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": now
                         }
 
         except Exception as e:
-            print(f"Correction handling error: {e}")
+            print(f"Correction handling error: {_truncate_for_log(e)}")
             correction_entry["error"] = str(e)
 
-        # Add to corrections log
-        state["corrections_made"].append(correction_entry)
+        # Add to corrections log, keeping only the most recent entries
+        corrections = state["corrections_made"]
+        corrections.append(correction_entry)
+        overflow = len(corrections) - science_config.MAX_CORRECTION_HISTORY
+        if overflow > 0:
+            del corrections[:overflow]
 
         return state
 
@@ -1376,45 +1602,86 @@ Analyze what the user is correcting and respond in JSON format:
 class FormsAnalysisNode(BaseNode):
     """Node for forms analysis based on assigned tags"""
 
+    def __init__(self):
+        super().__init__()
+        # System prompt depends only on which tags are assigned, so cache the
+        # message per tag combination instead of rebuilding it on every analysis
+        self._system_message_cache: Dict[Tuple[str, ...], SystemMessage] = {}
+        # Prompt text for each tag definition, in knowledge base order
+        self._tag_text_blocks = self._build_tag_text_blocks()
+        # The analysis depends only on the assigned tags, so parsed results are
+        # kept in a small LRU cache keyed by the sorted tag set
+        self._analysis_cache: "OrderedDict[Tuple[str, ...], Dict[str, Any]]" = OrderedDict()
+
+    def _max_output_tokens(self) -> int:
+        """The full analysis is much longer than the other nodes' JSON answers"""
+        return science_config.FORMS_ANALYSIS_MAX_OUTPUT_TOKENS
+
     def __call__(self, state: TaxConsultationState) -> TaxConsultationState:
         """Process forms analysis phase"""
 
         try:
             # Generate forms analysis
             analysis_result = self._generate_forms_analysis(state)
+            return self._apply_forms_analysis(state, analysis_result)
 
-            # Update state with analysis results
-            state["required_forms"] = analysis_result.get("required_forms", [])
-            state["compliance_checklist"] = analysis_result.get("compliance_checklist", [])
-            state["estimated_complexity"] = analysis_result.get("estimated_complexity", "medium")
-            state["recommendations"] = analysis_result.get("recommendations", [])
-            state["next_steps"] = analysis_result.get("next_steps", [])
-            state["priority_deadlines"] = analysis_result.get("priority_deadlines", [])
-
-            # Format comprehensive response
-            response = self._format_analysis_response(analysis_result)
-            state["assistant_response"] = response
+        except Exception as e:
+            return self._handle_forms_analysis_error(state, e)
 
-            # Add to conversation
-            state = add_message_to_state(state, "assistant", response)
+    async def acall(self, state: TaxConsultationState) -> TaxConsultationState:
+        """
+        Process forms analysis phase asynchronously
 
-            # Mark as completed
-            state["current_phase"] = "completed"
-            state = update_state_timestamp(state)
+        Used when the workflow runs via ainvoke, so the provider call is awaited
+        instead of occupying a worker thread for the whole request.
+        """
 
-            return state
+        try:
+            # Generate forms analysis
+            analysis_result = await self._agenerate_forms_analysis(state)
+            return self._apply_forms_analysis(state, analysis_result)
 
         except Exception as e:
-            state["error_message"] = f"Forms analysis error: {str(e)}"
-            state["assistant_response"] = "I apologize, but I encountered an error during forms analysis. Please consult with a tax professional."
-            # Set default values to prevent NoneType errors downstream
-            state["estimated_complexity"] = "high"
-            state["required_forms"] = []
-            state["recommendations"] = ["Consult with a qualified tax professional"]
-            state["next_steps"] = []
-            state["priority_deadlines"] = []
-            state["compliance_checklist"] = []
-            return state
+            return self._handle_forms_analysis_error(state, e)
+
+    def _apply_forms_analysis(self, state: TaxConsultationState, analysis_result: Dict[str, Any]) -> TaxConsultationState:
+        """Update state with forms analysis results"""
+
+        # Update state with analysis results
+        state["required_forms"] = analysis_result.get("required_forms", [])
+        state["compliance_checklist"] = analysis_result.get("compliance_checklist", [])
+        state["estimated_complexity"] = analysis_result.get("estimated_complexity", "medium")
+        state["recommendations"] = analysis_result.get("recommendations", [])
+        state["next_steps"] = analysis_result.get("next_steps", [])
+        state["priority_deadlines"] = analysis_result.get("priority_deadlines", [])
+
+        # Format comprehensive response
+        response = self._format_analysis_response(analysis_result)
+        state["assistant_response"] = response
+
+        # Add to conversation
+        now = current_timestamp()
+        state = add_message_to_state(state, "assistant", response, now)
+
+        # Mark as completed
+        state["current_phase"] = "completed"
+        state = update_state_timestamp(state, now)
+
+        return state
+
+    def _handle_forms_analysis_error(self, state: TaxConsultationState, error: Exception) -> TaxConsultationState:
+        """Record a forms analysis error and set safe defaults"""
+
+        state["error_message"] = f"Forms analysis error: {str(error)}"
+        state["assistant_response"] = "I apologize, but I encountered an error during forms analysis. Please consult with a tax professional."
+        # Set default values to prevent NoneType errors downstream
+        state["estimated_complexity"] = "high"
+        state["required_forms"] = []
+        state["recommendations"] = ["Consult with a qualified tax professional"]
+        state["next_steps"] = []
+        state["priority_deadlines"] = []
+        state["compliance_checklist"] = []
+        return state
 
     def _generate_forms_analysis(self, state: TaxConsultationState) -> Dict[str, Any]:
         """Generate forms analysis using LLM"""
@@ -1423,54 +1690,146 @@ class FormsAnalysisNode(BaseNode):
         if not tags:
             return {"required_forms": [], "recommendations": ["Please complete the intake process first."]}
 
-        # Build tag definitions text
-        tag_definitions = self.knowledge_base.get("tags", {}).get("tag_definitions", {})
-        tags_text = ""
-        for tag_name, tag_info in tag_definitions.items():
-            if tag_name in tags:
-                description = tag_info.get("description", "No description")
-                forms = tag_info.get("forms", {})
-                tags_text += f"\n**{tag_name}**: {description}\n"
-                if forms:
-                    for jurisdiction, form_list in forms.items():
-                        # Each form in form_list is a dict with 'form' and 'note' keys
-                        form_names = [f.get('form', str(f)) if isinstance(f, dict) else str(f) for f in form_list]
-                        tags_text += f"  - {jurisdiction}: {', '.join(form_names)}\n"
+        cache_key = tuple(sorted(set(tags)))
+        cached = self._get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.invoke(self._build_forms_analysis_messages(tags))
+        _warn_if_truncated(response, "Forms analysis")
+        return self._parse_and_cache_forms_analysis(response.content, tags, cache_key)
+
+    async def _agenerate_forms_analysis(self, state: TaxConsultationState) -> Dict[str, Any]:
+        """Generate forms analysis using LLM without blocking the event loop"""
+
+        tags = state["assigned_tags"]
+        if not tags:
+            return {"required_forms": [], "recommendations": ["Please complete the intake process first."]}
+
+        cache_key = tuple(sorted(set(tags)))
+        cached = self._get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+
+        # Stream the response so tokens are emitted to LangGraph stream consumers
+        # as they arrive; the JSON is parsed once the object is complete
+        response = None
+        async for chunk in self.llm.astream(self._build_forms_analysis_messages(tags)):
+            response = chunk if response is None else response + chunk
+
+        content = response.content if response is not None else ""
+        _warn_if_truncated(response, "Forms analysis")
+        return self._parse_and_cache_forms_analysis(content, tags, cache_key)
+
+    def _get_cached_analysis(self, cache_key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached analysis for this tag set, if any"""
+
+        cached = self._analysis_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        self._analysis_cache.move_to_end(cache_key)
+        # Copy so state updates for one session can't leak into another
+        return copy.deepcopy(cached)
+
+    def _parse_and_cache_forms_analysis(self, content: str, tags: List[str], cache_key: Tuple[str, ...]) -> Dict[str, Any]:
+        """Parse LLM forms analysis output, caching it when it parsed cleanly"""
+
+        analysis_result = self._try_parse_forms_analysis(content)
+        if analysis_result is None:
+            return self._fallback_forms_analysis(tags)
+
+        # Fallback results are never cached so a transient bad response isn't repeated
+        self._analysis_cache[cache_key] = copy.deepcopy(analysis_result)
+        self._analysis_cache.move_to_end(cache_key)
+        while len(self._analysis_cache) > science_config.FORMS_ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+        return analysis_result
+
+    def _build_forms_analysis_messages(self, tags: List[str]) -> List[Any]:
+        """Build LLM messages for forms analysis"""
 
-        system_prompt = build_forms_analysis_system_prompt(tags_text)
         user_prompt = build_forms_analysis_user_prompt(tags)
 
-        messages = [
-            SystemMessage(content=system_prompt),
+        return [
+            self._get_system_message(tags),
             HumanMessage(content=user_prompt)
         ]
 
-        response = self.llm.invoke(messages)
-        content = response.content
+    def _try_parse_forms_analysis(self, content: str) -> Optional[Dict[str, Any]]:
+        """Extract the JSON analysis from LLM output, or None if it can't be parsed"""
 
         # Parse JSON response
         try:
             # Extract JSON from response
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(content)
             if json_match:
                 json_str = json_match.group(0)
-                analysis_result = json.loads(json_str)
+                analysis_result = _parse_json(json_str)
             else:
                 raise ValueError("No JSON found in response")
 
             return analysis_result
 
         except Exception as e:
-            # Fallback analysis
-            return {
-                "analysis_summary": f"Analysis for tags: {', '.join(tags)}. Please consult a tax professional for detailed requirements.",
-                "required_forms": [],
-                "estimated_complexity": "high",
-                "recommendations": ["Consult with a qualified tax professional", "Gather all relevant tax documents"],
-                "next_steps": ["Schedule consultation with tax professional"],
-                "priority_deadlines": [],
-                "compliance_checklist": []
-            }
+            return None
+
+    def _fallback_forms_analysis(self, tags: List[str]) -> Dict[str, Any]:
+        """Fallback analysis used when the LLM output can't be parsed"""
+
+        return {
+            "analysis_summary": f"Analysis for tags: {', '.join(tags)}. Please consult a tax professional for detailed requirements.",
+            "required_forms": [],
+            "estimated_complexity": "high",
+            "recommendations": ["Consult with a qualified tax professional", "Gather all relevant tax documents"],
+            "next_steps": ["Schedule consultation with tax professional"],
+            "priority_deadlines": [],
+            "compliance_checklist": []
+        }
+
+    def _get_system_message(self, tags: List[str]) -> SystemMessage:
+        """
+        Get the forms analysis system message for the assigned tags
+
+        Messages are cached per tag combination and reused across requests; the
+        knowledge base does not change after the node is created and the model
+        clients never modify input messages.
+        """
+        assigned = set(tags)
+        key = tuple(tag_name for tag_name in self._tag_text_blocks if tag_name in assigned)
+
+        system_message = self._system_message_cache.get(key)
+        if system_message is None:
+            system_prompt = build_forms_analysis_system_prompt(self._build_tags_text(key))
+            system_message = SystemMessage(content=system_prompt)
+            self._system_message_cache[key] = system_message
+
+        return system_message
+
+    def _build_tag_text_blocks(self) -> Dict[str, str]:
+        """Render the prompt text for every tag definition once"""
+
+        tag_definitions = self.knowledge_base.get("tags", {}).get("tag_definitions", {})
+        blocks = {}
+        for tag_name, tag_info in tag_definitions.items():
+            description = tag_info.get("description", "No description")
+            forms = tag_info.get("forms", {})
+            # One compact line per tag keeps the prompt short (fewer input tokens)
+            form_groups = []
+            for jurisdiction, form_list in forms.items():
+                # Each form in form_list is a dict with 'form' and 'note' keys
+                form_names = [f.get('form', str(f)) if isinstance(f, dict) else str(f) for f in form_list]
+                form_groups.append(f"{jurisdiction}: {', '.join(form_names)}")
+            forms_text = f" [{'; '.join(form_groups)}]" if form_groups else ""
+            blocks[tag_name] = f"- {tag_name}: {description}{forms_text}\n"
+
+        return blocks
+
+    def _build_tags_text(self, tag_names: Tuple[str, ...]) -> str:
+        """Build tag definitions text for the given tags"""
+
+        return "".join(self._tag_text_blocks[tag_name] for tag_name in tag_names)
 
     def _format_analysis_response(self, analysis: Dict[str, Any]) -> str:
         """Format analysis results into comprehensive response"""
@@ -1487,23 +1846,26 @@ class FormsAnalysisNode(BaseNode):
         if required_forms:
             sections.append("## Required Tax Forms")
 
-            # Group by priority
-            high_priority = [f for f in required_forms if f.get("priority") == "high"]
-            medium_priority = [f for f in required_forms if f.get("priority") == "medium"]
-            low_priority = [f for f in required_forms if f.get("priority") == "low"]
+            # Group by priority in one pass (forms with any other priority are not listed)
+            by_priority = {"high": [], "medium": [], "low": []}
+            for form in required_forms:
+                group = by_priority.get(form.get("priority"))
+                if group is not None:
+                    group.append(form)
 
             for priority_group, forms, emoji in [
-                ("High Priority", high_priority, "🔴"),
-                ("Medium Priority", medium_priority, "🟡"),
-                ("Lower Priority", low_priority, "🟢")
+                ("High Priority", by_priority["high"], "🔴"),
+                ("Medium Priority", by_priority["medium"], "🟡"),
+                ("Lower Priority", by_priority["low"], "🟢")
             ]:
                 if forms:
                     sections.append(f"### {emoji} {priority_group}")
                     for form in forms:
                         sections.append(f"**{form['form']}** ({form['jurisdiction']})")
                         sections.append(f"- Due: {form['due_date']}")
-                        if form.get('description'):
-                            sections.append(f"- {form['description']}")
+                        description = form.get('description')
+                        if description:
+                            sections.append(f"- {description}")
                         sections.append("")
 
         # Complexity assessment
@@ -1535,13 +1897,14 @@ class CompletionNode(BaseNode):
     def __call__(self, state: TaxConsultationState) -> TaxConsultationState:
         """Handle completion phase"""
 
+        now = current_timestamp()
         if state["current_message"]:
             # User has a follow-up question
             response = "Your forms analysis has been completed. If you have specific questions about the recommendations or need clarification on any forms, please ask and I'll help clarify."
 
             state["assistant_response"] = response
-            state = add_message_to_state(state, "user", state["current_message"])
-            state = add_message_to_state(state, "assistant", response)
+            state = add_message_to_state(state, "user", state["current_message"], now)
+            state = add_message_to_state(state, "assistant", response, now)
 
-        state = update_state_timestamp(state)
+        state = update_state_timestamp(state, now)
         return state
\ No newline at end of file
@@ -5,7 +5,7 @@ Owner: Science Team
 
 This module centralizes all LLM prompts for better maintainability.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 def build_intake_system_prompt(gating_questions_text: str, current_module_info: str = "") -> str:
@@ -105,14 +105,14 @@ def build_forms_analysis_system_prompt(tags_text: str) -> str:
     Build system prompt for forms analysis phase
 
     Args:
-        tags_text: Formatted text of relevant tag definitions with forms
+        tags_text: One line per relevant tag definition with its forms
 
     Returns:
         Complete system prompt for forms analysis node
     """
     return f"""You are an expert cross-border tax consultant providing HOLISTIC, comprehensive forms analysis.
 
-TAG DEFINITIONS WITH REQUIRED FORMS:
+TAG DEFINITIONS WITH REQUIRED FORMS (format: "- tag: description [jurisdiction: forms; ...]"):
 {tags_text}
 
 YOUR EXPERTISE:
@@ -236,25 +236,12 @@ def build_tag_analysis_prompt(question_context: Dict[str, Any], user_response: s
     possible_tags = question_context.get('tags', [])
     action = question_context.get('action', '')
 
+    # Static instructions come first and the per-turn details last, so the prompt
+    # prefix is identical across turns and can be served from the provider's prompt cache
     return f"""You are analyzing a user's response in a cross-border tax intake interview to determine which tax tags should be assigned.
 
-QUESTION ASKED:
-{question_text}
-
-QUESTION ACTION:
-{action}
-
-POSSIBLE TAGS FROM THIS QUESTION:
-{', '.join(possible_tags) if possible_tags else 'None specified in action'}
-
-USER'S RESPONSE:
-{user_response}
-
-CONVERSATION HISTORY:
-{conversation_history}
-
 YOUR TASK:
-Analyze the user's response and determine:
+Analyze the user's response (given at the end) and determine:
 1. Which tags should be assigned based on their response
 2. Confidence level for each tag (high/medium/low)
 3. Whether clarification is needed for ambiguous responses
@@ -282,6 +269,21 @@ IMPORTANT:
 - Consider the full conversation context, not just this single response
 - User responses like "yes", "correct", "that's right" → high confidence
 - Vague responses like "maybe", "not sure", "partially" → low confidence or clarification needed
+
+CONVERSATION HISTORY:
+{conversation_history}
+
+QUESTION ASKED:
+{question_text}
+
+QUESTION ACTION:
+{action}
+
+POSSIBLE TAGS FROM THIS QUESTION:
+{', '.join(possible_tags) if possible_tags else 'None specified in action'}
+
+USER'S RESPONSE:
+{user_response}
 """
 
 
@@ -373,19 +375,15 @@ def build_multi_fact_extraction_prompt(user_response: str, conversation_history:
 
     tags_text = '\n'.join(tags_formatted)
 
+    # The tag list and instructions don't change between turns; keep them ahead of
+    # the conversation so the long prefix can be served from the provider's prompt cache
     return f"""You are analyzing a user's response in a cross-border tax interview to extract ALL relevant tax facts mentioned.
 
-USER'S RESPONSE:
-{user_response}
-
-CONVERSATION HISTORY:
-{conversation_history}
-
 AVAILABLE TAX TAGS:
 {tags_text}
 
 YOUR TASK:
-Extract ALL tax-relevant facts from the user's response, not just those related to one question. Look for mentions of:
+Extract ALL tax-relevant facts from the user's response (given at the end), not just those related to one question. Look for mentions of:
 - Citizenship/residency status
 - Employment (where, for whom, type)
 - Business ownership
@@ -427,14 +425,21 @@ IMPORTANT:
 - Distinguish between explicit facts (high confidence) and inferences (medium/low confidence)
 - Be conservative with inferences - don't assume too much
 - Evidence field should quote or paraphrase the relevant part of the response
+
+CONVERSATION HISTORY:
+{conversation_history}
+
+USER'S RESPONSE:
+{user_response}
 """
 
 
-def build_module_relevance_prompt(initial_response: str, conversation_summary: str, modules: List[Dict[str, str]]) -> str:
+def format_module_list(modules: List[Dict[str, str]]) -> str:
     """
-    Build prompt to determine which modules are relevant based on initial information
+    Render the AVAILABLE MODULES block of the module relevance prompt
 
-    This is Phase 3 enhancement: smart module skipping
+    The module list only depends on the knowledge base, so callers can render it
+    once and pass it back in as modules_text.
     """
 
     modules_formatted = []
@@ -444,7 +449,23 @@ def build_module_relevance_prompt(initial_response: str, conversation_summary: s
         module_desc = module.get('description', '')
         modules_formatted.append(f"- **{module_id}**: {module_name}\n  {module_desc}")
 
-    modules_text = '\n'.join(modules_formatted)
+    return '\n'.join(modules_formatted)
+
+
+def build_module_relevance_prompt(
+    initial_response: str,
+    conversation_summary: str,
+    modules: List[Dict[str, str]],
+    modules_text: Optional[str] = None
+) -> str:
+    """
+    Build prompt to determine which modules are relevant based on initial information
+
+    This is Phase 3 enhancement: smart module skipping
+    """
+
+    if modules_text is None:
+        modules_text = format_module_list(modules)
 
     return f"""You are analyzing a user's tax situation to determine which areas (modules) are relevant to explore.
 
@@ -612,7 +633,8 @@ def build_question_relevance_prompt(
     question: Dict[str, Any],
     conversation_summary: str,
     assigned_tags: List[str],
-    asked_questions: List[str]
+    asked_questions: List[str],
+    include_explanation: bool = False
 ) -> str:
     """
     Build prompt for LLM to determine if a question is still relevant to ask.
@@ -624,6 +646,8 @@ def build_question_relevance_prompt(
         conversation_summary: Summary of conversation so far
         assigned_tags: Tags assigned to user
         asked_questions: List of questions already asked
+        include_explanation: Also request the explanation shown to the user before
+            the question, instead of a separate build_explanation_prompt call
 
     Returns:
         Prompt for LLM to evaluate question relevance
@@ -632,6 +656,21 @@ def build_question_relevance_prompt(
     question_id = question.get("id", "")
     question_action = question.get("action", "")
 
+    explanation_section = ""
+    explanation_field = ""
+    if include_explanation:
+        explanation_section = """
+EXPLANATION:
+
+If should_skip is false, also write a brief, friendly explanation of why this question is relevant to the user's situation. It is shown to the user right before the question.
+- Keep it concise (2-3 sentences max)
+- Make it personal to their situation
+- Avoid jargon
+- Be encouraging and friendly
+If should_skip is true, use an empty string.
+"""
+        explanation_field = ',\n  "explanation": "friendly explanation to show user, or empty string"'
+
     return f"""You are evaluating whether a specific question is still relevant to ask in a tax consultation conversation.
 
 CONTEXT:
@@ -699,9 +738,9 @@ User said: "I am not a US citizen but I have a rental property in Seattle"
 Question: "Do you want to claim principal residence or moving expenses?"
 Analysis: User has US real estate, so US housing/real estate questions are relevant even though not US citizen
 Result: {{"should_skip": false, "reasoning": "User has US rental property, so US housing-related questions remain relevant despite not being US citizen"}}
-
+{explanation_section}
 Return ONLY valid JSON with this exact structure:
 {{
   "should_skip": boolean,
-  "reasoning": "brief explanation of decision"
+  "reasoning": "brief explanation of decision"{explanation_field}
 }}"""
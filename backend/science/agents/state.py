@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Any, Literal
 from typing_extensions import TypedDict
 from datetime import datetime
 import json
+import uuid
 
 
 class Message(TypedDict):
@@ -60,7 +61,7 @@ class TaxConsultationState(TypedDict):
     # Knowledge Base Context
     available_gating_questions: List[Dict[str, Any]]
     current_module_questions: List[Dict[str, Any]]
-    knowledge_base: Dict[str, Any]
+    knowledge_base: Dict[str, Any]  # Unused; the knowledge base is held by the nodes
     asked_question_ids: List[str]  # Track which questions have been asked
     skipped_question_ids: List[str]  # Track which questions were skipped due to context
 
@@ -91,10 +92,15 @@ class TaxConsultationState(TypedDict):
     updated_at: str
 
 
+def current_timestamp() -> str:
+    """Return the current time as an ISO-8601 string for state fields"""
+    return datetime.now().isoformat()
+
+
 def create_initial_state(session_id: str, initial_message: str = "") -> TaxConsultationState:
     """Create initial state for a new consultation session"""
 
-    now = datetime.now().isoformat()
+    now = current_timestamp()
 
     return TaxConsultationState(
         # Session Management
@@ -164,30 +170,30 @@ def create_initial_state(session_id: str, initial_message: str = "") -> TaxConsu
     )
 
 
-def update_state_timestamp(state: TaxConsultationState) -> TaxConsultationState:
-    """Update the state timestamp"""
-    state["updated_at"] = datetime.now().isoformat()
+def update_state_timestamp(state: TaxConsultationState, timestamp: Optional[str] = None) -> TaxConsultationState:
+    """Update the state timestamp, reusing `timestamp` when the caller already has one"""
+    state["updated_at"] = timestamp or current_timestamp()
     return state
 
 
 def add_message_to_state(
     state: TaxConsultationState,
     role: Literal["user", "assistant", "system"],
-    content: str
+    content: str,
+    timestamp: Optional[str] = None
 ) -> TaxConsultationState:
-    """Add a message to the conversation history"""
-
-    import uuid
+    """Add a message to the conversation history, reusing `timestamp` when the caller already has one"""
 
+    now = timestamp or current_timestamp()
     message = Message(
         id=str(uuid.uuid4()),
         role=role,
         content=content,
-        timestamp=datetime.now().isoformat()
+        timestamp=now
     )
 
     state["messages"].append(message)
-    state = update_state_timestamp(state)
+    state = update_state_timestamp(state, now)
 
     return state
 
@@ -7,10 +7,15 @@ This module defines the LangGraph workflow for tax consultation,
 orchestrating the flow between IntakeNode, FormsAnalysisNode, and CompletionNode.
 """
 import uuid
+import time
 import asyncio
-from typing import Dict, Any, List, Literal, Optional
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, List, Literal, Optional, Tuple
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 
 from science.config import science_config
@@ -67,10 +72,66 @@ class TaxConsultationWorkflow:
     This is the core AI workflow that science team owns and maintains.
     """
 
-    def __init__(self):
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None):
+        """
+        Args:
+            checkpointer: Where session state is stored. Defaults to an in-process
+                MemorySaver; pass a shared saver (e.g. a Redis or Postgres checkpointer)
+                so several workers or hosts can serve the same sessions.
+        """
         self.workflow = self._build_workflow()
-        self.memory = MemorySaver()
+        self.memory = checkpointer if checkpointer is not None else MemorySaver()
         self.app = self.workflow.compile(checkpointer=self.memory)
+        # Idle-session eviction only applies to the in-process store; a shared store
+        # also holds other workers' sessions and expires entries itself
+        self._evict_idle_sessions = checkpointer is None
+        # Session ID -> last activity (monotonic seconds), least recently active first
+        self._session_last_seen: "OrderedDict[str, float]" = OrderedDict()
+        # Session ID -> lock serializing that session's turns; an entry goes away once
+        # no turn holds or waits on it
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """Lock for one session's read-run-write cycle
+
+        Each turn reads the checkpointed state, runs the graph and writes the result
+        back, so two overlapping turns for the same session would each start from the
+        same state and the later write would drop the other's messages. This only
+        serializes turns within this process.
+        """
+
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    def _touch_session(self, session_id: str) -> None:
+        """Record activity for a session and drop the checkpoints of idle or excess sessions"""
+
+        if not self._evict_idle_sessions:
+            return
+
+        now = time.monotonic()
+        self._session_last_seen[session_id] = now
+        self._session_last_seen.move_to_end(session_id)
+
+        cutoff = now - science_config.SESSION_TTL_SECONDS
+        excess = len(self._session_last_seen) - science_config.MAX_SESSIONS
+        expired = []
+        for other_id, last_seen in self._session_last_seen.items():
+            if other_id == session_id or (last_seen >= cutoff and excess <= 0):
+                break
+            lock = self._session_locks.get(other_id)
+            if lock is not None and lock.locked():
+                # A turn is running on this session; it is touched again when the turn ends
+                continue
+            expired.append(other_id)
+            excess -= 1
+
+        for other_id in expired:
+            del self._session_last_seen[other_id]
+            self.memory.delete_thread(other_id)
 
     def _build_workflow(self) -> StateGraph:
         """Build the LangGraph workflow"""
@@ -79,8 +140,10 @@ class TaxConsultationWorkflow:
         workflow = StateGraph(TaxConsultationState)
 
         # Add nodes
+        # Forms analysis has an async path so ainvoke awaits the LLM call directly
+        forms_analysis_node = FormsAnalysisNode()
         workflow.add_node("intake", IntakeNode())
-        workflow.add_node("forms_analysis", FormsAnalysisNode())
+        workflow.add_node("forms_analysis", RunnableLambda(forms_analysis_node, afunc=forms_analysis_node.acall))
         workflow.add_node("completed", CompletionNode())
 
         # Set entry point
@@ -139,7 +202,9 @@ class TaxConsultationWorkflow:
         }
 
         # Run the workflow
-        result = await self.app.ainvoke(initial_state, config)
+        async with self._session_lock(session_id):
+            result = await self.app.ainvoke(initial_state, config)
+        self._touch_session(session_id)
 
         # Return with backward compatibility keys
         assistant_response = result.get("assistant_response", "")
@@ -170,21 +235,23 @@ class TaxConsultationWorkflow:
             "recursion_limit": science_config.WORKFLOW_RECURSION_LIMIT
         }
 
-        # Get current state
-        current_state = await self.app.aget_state(config)
+        async with self._session_lock(session_id):
+            # Get current state
+            current_state = await self.app.aget_state(config)
 
-        if not current_state:
-            return {
-                "error": "Session not found",
-                "session_id": session_id
-            }
+            if not current_state.values:
+                return {
+                    "error": "Session not found",
+                    "session_id": session_id
+                }
 
-        # Update state with new message
-        state = current_state.values
-        state["current_message"] = message
+            # Update state with new message
+            state = current_state.values
+            state["current_message"] = message
 
-        # Run the workflow
-        result = await self.app.ainvoke(state, config)
+            # Run the workflow
+            result = await self.app.ainvoke(state, config)
+        self._touch_session(session_id)
 
         # Return with backward compatibility keys
         assistant_response = result.get("assistant_response", "")
@@ -201,36 +268,42 @@ class TaxConsultationWorkflow:
         }
 
     async def force_forms_analysis(self, session_id: str) -> Dict[str, Any]:
-        """Force transition to forms analysis"""
+        """Force transition to forms analysis
+
+        The session is read under its lock: a state loaded earlier can miss turns
+        that finished since, and writing it back would drop them.
+        """
 
         config = {
             "configurable": {"thread_id": session_id},
             "recursion_limit": 10  # Prevent infinite loops
         }
 
-        # Get current state
-        current_state = await self.app.aget_state(config)
+        async with self._session_lock(session_id):
+            # Get current state
+            current_state = await self.app.aget_state(config)
 
-        if not current_state:
-            return {"error": "Session not found"}
+            if not current_state.values:
+                return {"error": "Session not found"}
 
-        state = current_state.values
+            state = current_state.values
 
-        # Check if we have enough information
-        if len(state.get("assigned_tags", [])) < 1:
-            return {
-                "error": "No tags assigned yet. Please continue the conversation to gather more information.",
-                "session_id": session_id
-            }
+            # Check if we have enough information
+            if len(state.get("assigned_tags", [])) < 1:
+                return {
+                    "error": "No tags assigned yet. Please continue the conversation to gather more information.",
+                    "session_id": session_id
+                }
 
-        # Force transition
-        state["should_transition"] = True
-        state["transition_reason"] = "Forced transition to forms analysis"
-        state["current_phase"] = "forms_analysis"
-        state["current_message"] = "Please provide a summary of my tax requirements based on our conversation."
+            # Force transition
+            state["should_transition"] = True
+            state["transition_reason"] = "Forced transition to forms analysis"
+            state["current_phase"] = "forms_analysis"
+            state["current_message"] = "Please provide a summary of my tax requirements based on our conversation."
 
-        # Run the workflow
-        result = await self.app.ainvoke(state, config)
+            # Run the workflow
+            result = await self.app.ainvoke(state, config)
+        self._touch_session(session_id)
 
         return {
             "session_id": session_id,
@@ -252,10 +325,21 @@ class TaxConsultationWorkflow:
         # Get current state
         current_state = await self.app.aget_state(config)
 
-        if not current_state:
+        if not current_state.values:
             return None
 
-        state = current_state.values
+        return self.build_session_summary(session_id, current_state.values)
+
+    def build_session_summary(self, session_id: str, state: TaxConsultationState) -> Dict[str, Any]:
+        """Build a session summary from an already loaded state
+
+        Args:
+            session_id: Session ID
+            state: State values from the checkpointer
+
+        Returns:
+            Session summary dict (same shape as get_session_summary)
+        """
 
         return {
             "session_id": session_id,
@@ -293,7 +377,7 @@ class TaxConsultationWorkflow:
         # Get current state
         current_state = await self.app.aget_state(config)
 
-        if not current_state:
+        if not current_state.values:
             return []
 
         state = current_state.values
@@ -310,7 +394,7 @@ class TaxConsultationWorkflow:
         # Get current state
         current_state = await self.app.aget_state(config)
 
-        if not current_state:
+        if not current_state.values:
             return {"error": "Session not found"}
 
         state = current_state.values
@@ -329,7 +413,8 @@ class TaxConsultationWorkflow:
             "jurisdictions": state.get("jurisdictions", []),
             "workflow_state": current_state.next,
             "created_at": state.get("created_at"),
-            "updated_at": state.get("updated_at")
+            "updated_at": state.get("updated_at"),
+            "checkpoint_id": current_state.config["configurable"].get("checkpoint_id")
         }
 
     async def get_session_state(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -342,6 +427,25 @@ class TaxConsultationWorkflow:
             Full state dict or None if session not found
         """
 
+        checkpoint = await self.get_session_checkpoint(session_id)
+        if checkpoint is None:
+            return None
+
+        return checkpoint[0]
+
+    async def get_session_checkpoint(self, session_id: str) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        """Get full session state with the ID of the checkpoint it was read from
+
+        Every write to a session creates a new checkpoint, so the ID identifies
+        this exact version of the state.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            (state dict, checkpoint ID), or None if session not found
+        """
+
         config = {
             "configurable": {"thread_id": session_id},
             "recursion_limit": 10
@@ -349,10 +453,10 @@ class TaxConsultationWorkflow:
 
         current_state = await self.app.aget_state(config)
 
-        if not current_state:
+        if not current_state.values:
             return None
 
-        return current_state.values
+        return current_state.values, current_state.config["configurable"].get("checkpoint_id")
 
     async def force_transition_to_forms_analysis(self, session_id: str) -> Dict[str, Any]:
         """Force transition to forms analysis (alias for force_forms_analysis)
@@ -27,13 +27,47 @@ class ScienceConfig:
 
     # LLM Configuration
     LLM_TEMPERATURE: float = 0.1
+    USE_JSON_RESPONSE_MODE: bool = True  # Ask the provider for pure JSON output (all node prompts expect JSON)
+    FORMS_ANALYSIS_CACHE_SIZE: int = 256  # Parsed forms analyses kept per tag set (LRU)
+    # Output token caps; reasoning models count reasoning tokens against these too
+    LLM_MAX_OUTPUT_TOKENS: int = 2048  # Short JSON answers (tag analysis, relevance checks, ...)
+    FORMS_ANALYSIS_MAX_OUTPUT_TOKENS: int = 6144  # Full forms analysis JSON
+    # Provider SDK retries: jittered exponential backoff, only on transient errors
+    # (connection errors, timeouts, 429 and 5xx); auth and bad-request errors fail fast
+    LLM_MAX_RETRIES: int = 2
+    # Tag OpenAI requests with a per-node, per-knowledge-base prompt_cache_key so every
+    # worker's requests for the same static prompt prefix are routed to the same provider cache
+    USE_PROMPT_CACHE_KEY: bool = True
+    # Connection pool shared by the OpenAI clients of all nodes
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_USE_HTTP2: bool = True  # Multiplex concurrent requests over one connection (needs the h2 package)
+
+    # Logging: per-decision debug output (question/module skips) is off unless enabled
+    DEBUG_LOGGING: bool = os.getenv("SCIENCE_DEBUG_LOGGING", "").lower() in ("1", "true")
+
+    # Knowledge base directory (containing intake/ and tags/); empty means the bundled
+    # knowledge_cache, falling back to data/knowledge_base
+    KNOWLEDGE_BASE_DIR: str = os.getenv("KNOWLEDGE_BASE_DIR", "")
 
     # Workflow Configuration
     WORKFLOW_RECURSION_LIMIT: int = 25
+    # In-memory sessions: checkpoints of sessions idle longer than the TTL, or beyond the
+    # most recently active MAX_SESSIONS, are dropped so memory stays bounded. This only
+    # applies to the default MemorySaver; a checkpointer passed to TaxConsultationWorkflow
+    # is left alone and must expire sessions itself
+    SESSION_TTL_SECONDS: int = 2 * 60 * 60
+    MAX_SESSIONS: int = 1000
     MIN_TAGS_FOR_TRANSITION: int = 6  # Increased from 2 to prevent premature transition
     MIN_CONVERSATION_LENGTH: int = 24  # Increased from 6 to ensure thorough intake (12 Q&A pairs)
     MIN_GATING_QUESTIONS_ASKED: int = 8  # Minimum gating questions before allowing transition
     MIN_QUESTIONS_BEFORE_SKIPPING: int = 5  # Ask at least 5 questions before LLM can skip questions
+    # Upcoming questions whose LLM skip checks run concurrently once a question has been
+    # skipped (the first candidate is always checked alone). Checks past the chosen
+    # question are discarded, so each extra slot can cost one wasted relevance request
+    # per turn in exchange for lower latency during runs of skips; 1 disables batching
+    SKIP_CHECK_BATCH_SIZE: int = 3
+    MAX_CORRECTION_HISTORY: int = 50  # Cap on the corrections audit log kept in session state
 
     # Phase 2: LLM Intelligence Features (Feature Flags)
     USE_LLM_TAG_ASSIGNMENT: bool = True  # Enable LLM-based tag analysis with confidence scoring
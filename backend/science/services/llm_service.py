@@ -3,36 +3,133 @@ LLM Service
 
 Centralized LLM initialization and configuration.
 """
+from functools import lru_cache
+from typing import Optional
+
+import httpx
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 
 from science.config import science_config
 
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:  # optional; connections fall back to HTTP/1.1 keep-alive
+    h2 = None
+
+
+@lru_cache(maxsize=1)
+def _get_openai_http_client() -> httpx.Client:
+    """
+    Shared HTTP connection pool for every OpenAI chat model in the process.
+
+    Nodes are created separately, so without this each model would open and
+    keep alive its own connections to the same host. With HTTP/2, concurrent
+    requests (batched relevance checks) share one connection instead of each
+    opening another.
+    """
+    return httpx.Client(
+        # Timeouts are left to the OpenAI client, as with its default HTTP client
+        timeout=None,
+        http2=science_config.LLM_USE_HTTP2 and h2 is not None,
+        limits=httpx.Limits(
+            max_connections=science_config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=science_config.LLM_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+
 
-def get_llm():
+def get_llm(
+    json_mode: bool = False,
+    max_output_tokens: Optional[int] = None,
+    prompt_cache_key: Optional[str] = None
+):
     """
     Initialize and return the configured LLM based on provider settings.
 
+    Models are shared: nodes (and workflows) asking for the same settings get the
+    same instance instead of each building its own client.
+
+    Args:
+        json_mode: Constrain the model to return a single JSON object
+        max_output_tokens: Cap on generated tokens (None for the provider default)
+        prompt_cache_key: OpenAI prompt cache routing key for requests sharing a
+            prompt prefix (ignored by Gemini, which has no equivalent request option)
+
     Returns:
         Configured LLM instance (ChatOpenAI or ChatGoogleGenerativeAI)
 
     Raises:
         ValueError: If an unsupported AI model provider is configured
     """
-    if science_config.AI_MODEL_PROVIDER == "openai":
-        return ChatOpenAI(
-            model=science_config.OPENAI_MODEL,
-            temperature=science_config.LLM_TEMPERATURE,
-            api_key=science_config.OPENAI_API_KEY
+    provider = science_config.AI_MODEL_PROVIDER
+    if provider == "openai":
+        return _create_openai_llm(
+            science_config.OPENAI_MODEL,
+            science_config.OPENAI_API_KEY,
+            science_config.LLM_TEMPERATURE,
+            science_config.LLM_MAX_RETRIES,
+            json_mode,
+            max_output_tokens,
+            prompt_cache_key
         )
-    elif science_config.AI_MODEL_PROVIDER == "gemini":
-        return ChatGoogleGenerativeAI(
-            model=science_config.GEMINI_MODEL,
-            temperature=science_config.LLM_TEMPERATURE,
-            google_api_key=science_config.GEMINI_API_KEY
+    elif provider == "gemini":
+        return _create_gemini_llm(
+            science_config.GEMINI_MODEL,
+            science_config.GEMINI_API_KEY,
+            science_config.LLM_TEMPERATURE,
+            science_config.LLM_MAX_RETRIES,
+            json_mode,
+            max_output_tokens
         )
     else:
         raise ValueError(
-            f"Unsupported AI model provider: {science_config.AI_MODEL_PROVIDER}. "
+            f"Unsupported AI model provider: {provider}. "
             "Supported providers: 'openai', 'gemini'"
-        )
\ No newline at end of file
+        )
+
+
+# Keyed on every setting that goes into the model, so config changes still take effect
+@lru_cache(maxsize=16)
+def _create_openai_llm(
+    model: str,
+    api_key: str,
+    temperature: float,
+    max_retries: int,
+    json_mode: bool,
+    max_output_tokens: Optional[int],
+    prompt_cache_key: Optional[str]
+) -> ChatOpenAI:
+    """Build a ChatOpenAI model, shared by every caller with the same settings"""
+    model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    if prompt_cache_key:
+        model_kwargs["prompt_cache_key"] = prompt_cache_key
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=api_key,
+        max_tokens=max_output_tokens,
+        max_retries=max_retries,
+        http_client=_get_openai_http_client(),
+        model_kwargs=model_kwargs
+    )
+
+
+@lru_cache(maxsize=16)
+def _create_gemini_llm(
+    model: str,
+    api_key: str,
+    temperature: float,
+    max_retries: int,
+    json_mode: bool,
+    max_output_tokens: Optional[int]
+) -> ChatGoogleGenerativeAI:
+    """Build a ChatGoogleGenerativeAI model, shared by every caller with the same settings"""
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        google_api_key=api_key,
+        max_output_tokens=max_output_tokens,
+        max_retries=max_retries,
+        response_mime_type="application/json" if json_mode else None
+    )
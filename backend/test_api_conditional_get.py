@@ -0,0 +1,60 @@
+"""
+Tests for ETag / If-None-Match handling on the session read endpoints
+"""
+import asyncio
+
+import pytest
+
+SESSION_ID = "etag-test"
+ENDPOINTS = [f"/session/{SESSION_ID}", f"/session/{SESSION_ID}/workflow_summary"]
+
+
+@pytest.fixture
+def session(workflow):
+    asyncio.run(workflow.start_consultation("", session_id=SESSION_ID))
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_response_carries_an_etag(api_client, session, path):
+    response = api_client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith(f'"{SESSION_ID}-')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_matching_if_none_match_returns_304(api_client, session, path):
+    etag = api_client.get(path).headers["etag"]
+
+    response = api_client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_changed_session_returns_200_with_a_new_etag(api_client, workflow, session, path):
+    etag = api_client.get(path).headers["etag"]
+    asyncio.run(workflow.continue_consultation(SESSION_ID, "Yes"))
+
+    response = api_client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_state_write_without_a_new_timestamp_changes_the_etag(api_client, workflow, session, path):
+    etag = api_client.get(path).headers["etag"]
+    # A direct state write, like IntakeNode's error path, leaves updated_at as it was
+    workflow.app.update_state(
+        {"configurable": {"thread_id": SESSION_ID}},
+        {"error_message": "LLM call failed"}
+    )
+
+    response = api_client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -0,0 +1,70 @@
+"""
+Tests for Accept-header negotiation on the streaming endpoints: server-sent events
+by default, one JSON payload for clients that ask for application/json
+"""
+import asyncio
+import json
+
+import pytest
+
+from science.config import science_config
+
+SESSION_ID = "negotiation-test"
+ENDPOINTS = [
+    ("/chat", {"session_id": SESSION_ID, "message": "Yes"}),
+    (f"/session/{SESSION_ID}/force_final", None),
+]
+# Anything that doesn't ask for JSON alone keeps the event stream existing clients read
+SSE_ACCEPT_HEADERS = ["text/event-stream", "*/*", "", "application/json, text/event-stream"]
+
+
+@pytest.fixture
+def session(workflow, monkeypatch):
+    """A session with enough tags for force_final to run"""
+    monkeypatch.setattr(science_config, "MIN_TAGS_FOR_TRANSITION", 1)
+    asyncio.run(workflow.start_consultation("", session_id=SESSION_ID))
+    workflow.app.update_state(
+        {"configurable": {"thread_id": SESSION_ID}},
+        {"assigned_tags": ["us_person_worldwide_filing"]}
+    )
+
+
+def post(api_client, path, body, accept):
+    return api_client.post(path, json=body, headers={"Accept": accept})
+
+
+def sse_events(response):
+    return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+
+@pytest.mark.parametrize("path, body", ENDPOINTS)
+def test_accept_json_returns_one_json_payload(api_client, session, path, body):
+    response = post(api_client, path, body, "application/json")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    payload = response.json()
+    assert payload["is_final"] is True
+    assert "content" in payload
+
+
+@pytest.mark.parametrize("accept", SSE_ACCEPT_HEADERS)
+@pytest.mark.parametrize("path, body", ENDPOINTS)
+def test_other_accept_headers_keep_the_event_stream(api_client, session, path, body, accept):
+    response = post(api_client, path, body, accept)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/event-stream"
+    assert response.headers["cache-control"] == "no-cache"
+    events = sse_events(response)
+    assert events and events[-1]["is_final"] is True
+
+
+def test_json_payload_merges_the_streamed_events(api_client, session):
+    path = f"/session/{SESSION_ID}/force_final"
+    events = sse_events(post(api_client, path, None, "text/event-stream"))
+    payload = post(api_client, path, None, "application/json").json()
+
+    assert payload["content"] == "".join(event.get("content", "") for event in events[:-1])
+    assert payload["forms_analysis"] == events[-1]["forms_analysis"]
+    assert set(payload) == {"content"} | set(events[-1])
@@ -0,0 +1,73 @@
+"""
+Tests for the FormsAnalysisNode per-tag-set analysis cache
+"""
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from science.agents.nodes import FormsAnalysisNode
+from science.agents.state import create_initial_state
+from science.config import science_config
+
+VALID_ANALYSIS = '{"required_forms": [{"form": "FBAR"}], "estimated_complexity": "medium", "recommendations": ["File on time"]}'
+# A second valid answer, so a repeated LLM call shows up as a different result
+OTHER_ANALYSIS = '{"required_forms": [], "estimated_complexity": "low", "recommendations": []}'
+
+
+@pytest.fixture
+def node(fake_llm):
+    return FormsAnalysisNode()
+
+
+def analyze(node, tags):
+    state = create_initial_state("cache-test")
+    state["assigned_tags"] = list(tags)
+    return node._generate_forms_analysis(state)
+
+
+def test_same_tags_in_any_order_hit_the_cache(node):
+    node.llm = FakeListChatModel(responses=[VALID_ANALYSIS, OTHER_ANALYSIS])
+
+    first = analyze(node, ["us_person_worldwide_filing", "fbar"])
+    second = analyze(node, ["fbar", "us_person_worldwide_filing"])
+
+    assert first["estimated_complexity"] == "medium"
+    assert second == first
+
+
+def test_fallback_results_are_not_cached(node):
+    node.llm = FakeListChatModel(responses=["not json", VALID_ANALYSIS])
+
+    fallback = analyze(node, ["fbar"])
+    retried = analyze(node, ["fbar"])
+
+    assert fallback["estimated_complexity"] == "high"
+    assert retried["required_forms"] == [{"form": "FBAR"}]
+    assert list(node._analysis_cache) == [("fbar",)]
+
+
+def test_least_recently_used_tag_set_is_evicted_at_capacity(node, monkeypatch):
+    monkeypatch.setattr(science_config, "FORMS_ANALYSIS_CACHE_SIZE", 2)
+    node.llm = FakeListChatModel(responses=[VALID_ANALYSIS, OTHER_ANALYSIS])
+
+    analyze(node, ["a"])
+    analyze(node, ["b"])
+    analyze(node, ["a"])  # refreshes "a", leaving "b" least recently used
+    analyze(node, ["c"])
+
+    assert list(node._analysis_cache) == [("a",), ("c",)]
+    assert analyze(node, ["a"])["estimated_complexity"] == "medium"
+
+
+def test_mutating_a_result_does_not_change_the_cached_copy(node):
+    node.llm = FakeListChatModel(responses=[VALID_ANALYSIS, OTHER_ANALYSIS])
+
+    stored = analyze(node, ["fbar"])
+    stored["required_forms"].append({"form": "8938"})
+    cached = analyze(node, ["fbar"])
+    cached["recommendations"].clear()
+
+    assert analyze(node, ["fbar"]) == {
+        "required_forms": [{"form": "FBAR"}],
+        "estimated_complexity": "medium",
+        "recommendations": ["File on time"]
+    }
@@ -0,0 +1,93 @@
+"""
+Tests for how IntakeNode batches the LLM relevance checks for upcoming questions
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from science.agents.nodes import IntakeNode
+from science.agents.state import create_initial_state
+from science.config import science_config
+
+QUESTIONS = [{"id": f"q{i}", "question": f"Question number {i}?"} for i in range(1, 7)]
+
+
+class RelevanceCheckRecorder:
+    """Stand-in LLM that skips the given questions and records each batch it is sent"""
+
+    def __init__(self, skip_ids):
+        self.skip_ids = set(skip_ids)
+        self.batches = []
+        self.prompts = []
+
+    def batch(self, requests, return_exceptions=False):
+        self.prompts.extend(messages[0].content for messages in requests)
+        self.batches.append([self._question_id(messages[0].content) for messages in requests])
+        return [
+            SimpleNamespace(content=json.dumps({
+                "should_skip": self._question_id(messages[0].content) in self.skip_ids,
+                "reasoning": "test"
+            }))
+            for messages in requests
+        ]
+
+    @staticmethod
+    def _question_id(prompt):
+        return next(q["id"] for q in QUESTIONS if q["question"] in prompt)
+
+
+@pytest.fixture
+def node(fake_llm, monkeypatch):
+    monkeypatch.setattr(science_config, "USE_LLM_QUESTION_SKIPPING", True)
+    monkeypatch.setattr(science_config, "USE_EXPLANATION_GENERATION", False)
+    monkeypatch.setattr(science_config, "MIN_QUESTIONS_BEFORE_SKIPPING", 0)
+    monkeypatch.setattr(science_config, "SKIP_CHECK_BATCH_SIZE", 3)
+    return IntakeNode()
+
+
+def select(node, skip_ids):
+    node.llm = RelevanceCheckRecorder(skip_ids)
+    state = create_initial_state("skip-test")
+    question = node._first_unskipped_question(QUESTIONS, state)
+    return question, state, node.llm.batches
+
+
+def test_first_candidate_kept_costs_one_check(node):
+    question, state, batches = select(node, skip_ids=[])
+
+    assert question["id"] == "q1"
+    assert batches == [["q1"]]
+    assert state["skipped_question_ids"] == []
+
+
+def test_checks_run_ahead_only_after_a_skip(node):
+    question, state, batches = select(node, skip_ids=["q1", "q2"])
+
+    assert question["id"] == "q3"
+    assert batches == [["q1"], ["q2", "q3", "q4"]]
+    assert state["skipped_question_ids"] == ["q1", "q2"]
+
+
+def test_explanations_are_only_requested_from_single_checks(node, monkeypatch):
+    monkeypatch.setattr(science_config, "USE_EXPLANATION_GENERATION", True)
+    node.llm = RelevanceCheckRecorder(skip_ids=["q1"])
+    state = create_initial_state("skip-test")
+    state["messages"] = [{"role": "user", "content": "hi"}] * 3
+
+    node._first_unskipped_question(QUESTIONS, state)
+
+    assert node.llm.batches == [["q1"], ["q2", "q3", "q4"]]
+    assert ['"explanation"' in prompt for prompt in node.llm.prompts] == [True, False, False, False]
+
+
+def test_missing_check_results_mean_no_skips(node):
+    class ShortBatch(RelevanceCheckRecorder):
+        def batch(self, requests, return_exceptions=False):
+            return super().batch(requests, return_exceptions)[:-1]
+
+    node.llm = ShortBatch(skip_ids=["q1", "q2", "q3"])
+
+    checks = node._check_questions_with_llm(QUESTIONS[:3], create_initial_state("skip-test"))
+
+    assert checks == [(False, None)] * 3
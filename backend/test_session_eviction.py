@@ -0,0 +1,111 @@
+"""
+Tests for idle-session eviction in TaxConsultationWorkflow
+"""
+import asyncio
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+import science.agents.workflow as workflow_module
+from science.agents.workflow import TaxConsultationWorkflow
+from science.config import science_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(workflow_module.time, "monotonic", clock)
+    return clock
+
+
+def start(workflow, *session_ids):
+    for session_id in session_ids:
+        asyncio.run(workflow.start_consultation("", session_id=session_id))
+
+
+def has_checkpoint(workflow, session_id):
+    return workflow.memory.get_tuple({"configurable": {"thread_id": session_id}}) is not None
+
+
+def test_sessions_idle_past_the_ttl_are_dropped(fake_llm, clock, monkeypatch):
+    monkeypatch.setattr(science_config, "SESSION_TTL_SECONDS", 100)
+    workflow = TaxConsultationWorkflow()
+
+    start(workflow, "idle")
+    clock.now += 60
+    start(workflow, "recent")
+    clock.now += 60
+    start(workflow, "new")
+
+    assert not has_checkpoint(workflow, "idle")
+    assert has_checkpoint(workflow, "recent")
+    assert has_checkpoint(workflow, "new")
+
+
+def test_least_recently_active_session_is_dropped_at_the_cap(fake_llm, clock, monkeypatch):
+    monkeypatch.setattr(science_config, "MAX_SESSIONS", 2)
+    workflow = TaxConsultationWorkflow()
+
+    start(workflow, "first", "second")
+    clock.now += 1
+    asyncio.run(workflow.continue_consultation("first", "hello"))
+    clock.now += 1
+    start(workflow, "third")
+
+    assert not has_checkpoint(workflow, "second")
+    assert has_checkpoint(workflow, "first")
+    assert has_checkpoint(workflow, "third")
+
+
+def test_caller_supplied_checkpointer_is_not_evicted(fake_llm, clock, monkeypatch):
+    monkeypatch.setattr(science_config, "MAX_SESSIONS", 1)
+    monkeypatch.setattr(science_config, "SESSION_TTL_SECONDS", 1)
+    workflow = TaxConsultationWorkflow(checkpointer=MemorySaver())
+
+    start(workflow, "first")
+    clock.now += 60
+    start(workflow, "second")
+
+    assert has_checkpoint(workflow, "first")
+    assert has_checkpoint(workflow, "second")
+
+
+def test_session_with_a_running_turn_is_not_evicted(fake_llm, clock, monkeypatch):
+    monkeypatch.setattr(science_config, "MAX_SESSIONS", 1)
+    workflow = TaxConsultationWorkflow()
+
+    async def run():
+        await workflow.start_consultation("", session_id="busy")
+        async with workflow._session_lock("busy"):
+            await workflow.start_consultation("", session_id="other")
+            return has_checkpoint(workflow, "busy")
+
+    assert asyncio.run(run())
+
+
+def test_chat_on_an_evicted_session_starts_a_new_consultation(api_client, workflow, clock, monkeypatch):
+    monkeypatch.setattr(science_config, "SESSION_TTL_SECONDS", 100)
+    start(workflow, "expired")
+    clock.now += 200
+    start(workflow, "other")
+    assert asyncio.run(workflow.get_session_state("expired")) is None
+
+    response = api_client.post(
+        "/chat",
+        json={"session_id": "expired", "message": "Hello"},
+        headers={"Accept": "application/json"}
+    )
+
+    payload = response.json()
+    assert payload["is_final"] is True
+    assert payload["session_id"] != "expired"
+    assert payload["case_file"]["session_id"] == payload["session_id"]
+    assert not has_checkpoint(workflow, "expired")
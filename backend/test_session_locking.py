@@ -0,0 +1,44 @@
+"""
+Tests that turns for the same session don't overwrite each other's messages
+"""
+import asyncio
+
+SESSION_ID = "locking-test"
+
+
+def user_messages(state):
+    return [message["content"] for message in state["messages"] if message["role"] == "user"]
+
+
+def test_concurrent_turns_keep_every_message(workflow):
+    async def run():
+        await workflow.start_consultation("", session_id=SESSION_ID)
+        await asyncio.gather(*(
+            workflow.continue_consultation(SESSION_ID, f"message {i}") for i in range(4)
+        ))
+        return await workflow.get_session_state(SESSION_ID)
+
+    state = asyncio.run(run())
+
+    assert sorted(user_messages(state)) == [f"message {i}" for i in range(4)]
+
+
+def test_force_forms_analysis_keeps_turns_finished_after_an_earlier_read(workflow):
+    async def run():
+        await workflow.start_consultation("", session_id=SESSION_ID)
+        workflow.app.update_state(
+            {"configurable": {"thread_id": SESSION_ID}},
+            {"assigned_tags": ["us_person_worldwide_filing"]}
+        )
+        # Snapshot taken before the turn, as the force_final endpoint does for its check
+        stale_state = await workflow.get_session_state(SESSION_ID)
+        await workflow.continue_consultation(SESSION_ID, "latest answer")
+
+        result = await workflow.force_forms_analysis(SESSION_ID)
+        return stale_state, result
+
+    stale_state, result = asyncio.run(run())
+
+    assert "latest answer" not in user_messages(stale_state)
+    assert "error" not in result
+    assert "latest answer" in user_messages(result["state"])
@@ -41,14 +41,17 @@ export class TaxConsultantAPI {
     }
 
     const decoder = new TextDecoder();
+    // Holds a trailing partial line until the rest of it arrives in a later read
+    let buffer = '';
 
     try {
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -84,14 +87,17 @@ export class TaxConsultantAPI {
     }
 
     const decoder = new TextDecoder();
+    // Holds a trailing partial line until the rest of it arrives in a later read
+    let buffer = '';
 
     try {
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -135,14 +141,17 @@ export class TaxConsultantAPI {
     }
 
     const decoder = new TextDecoder();
+    // Holds a trailing partial line until the rest of it arrives in a later read
+    let buffer = '';
 
     try {
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n');
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -1,6 +1,7 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { TaxConsultantAPI } from '../api/client';
 import { CaseFile, ChatMessage } from '../types';
+import { typeOut } from '../utils/typewriter';
 
 export const useTaxConsultant = () => {
   const [sessionId, setSessionId] = useState<string | null>(null);
@@ -84,8 +85,10 @@ export const useTaxConsultant = () => {
 
       for await (const chunk of stream) {
         if (chunk.content) {
+          // The server sends text without pacing; the typing effect happens here
+          const revealFrom = fullResponse.length;
           fullResponse += chunk.content;
-          setCurrentStreamingMessage(fullResponse);
+          await typeOut(fullResponse, revealFrom, setCurrentStreamingMessage);
         }
 
         if (chunk.is_final) {
@@ -137,8 +140,10 @@ export const useTaxConsultant = () => {
 
       for await (const chunk of stream) {
         if (chunk.content) {
+          // The server sends text without pacing; the typing effect happens here
+          const revealFrom = fullResponse.length;
           fullResponse += chunk.content;
-          setCurrentStreamingMessage(fullResponse);
+          await typeOut(fullResponse, revealFrom, setCurrentStreamingMessage);
         }
 
         if (chunk.is_final) {
@@ -221,8 +226,10 @@ export const useTaxConsultant = () => {
 
       for await (const chunk of stream) {
         if (chunk.content) {
+          // The server sends text without pacing; the typing effect happens here
+          const revealFrom = fullResponse.length;
           fullResponse += chunk.content;
-          setCurrentStreamingMessage(fullResponse);
+          await typeOut(fullResponse, revealFrom, setCurrentStreamingMessage);
         }
 
         if (chunk.is_final) {
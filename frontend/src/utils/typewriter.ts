@@ -0,0 +1,69 @@
+// Client-side typing effect for streamed assistant messages
+
+// Default pace of the typing effect, in milliseconds per character
+export const TYPING_CHAR_DELAY_MS = 10;
+
+// Interval between screen updates; several characters are revealed per tick
+const TICK_MS = 16;
+
+// Text further behind than this is shown at once rather than typed out, so a long
+// reply (or one that arrived in a single event) doesn't hold up the stream
+const MAX_PENDING_CHARS = 400;
+
+/**
+ * Reveals `text` from index `from` to the end, calling `onUpdate` with each
+ * growing prefix. Resolves once the whole text is shown.
+ *
+ * The text is shown immediately when the tab is hidden, since browsers throttle
+ * timers in background tabs and the animation would stall the stream reader.
+ */
+export const typeOut = (
+  text: string,
+  from: number,
+  onUpdate: (visible: string) => void,
+  charDelayMs: number = TYPING_CHAR_DELAY_MS
+): Promise<void> => {
+  if (
+    charDelayMs <= 0 ||
+    from >= text.length ||
+    text.length - from > MAX_PENDING_CHARS ||
+    document.hidden
+  ) {
+    onUpdate(text);
+    return Promise.resolve();
+  }
+
+  const charsPerTick = Math.max(1, Math.round(TICK_MS / charDelayMs));
+
+  return new Promise(resolve => {
+    let position = from;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+
+    const finish = () => {
+      clearTimeout(timer);
+      document.removeEventListener('visibilitychange', onVisibilityChange);
+      onUpdate(text);
+      resolve();
+    };
+
+    // Tab moved to the background mid-animation: show the rest right away
+    const onVisibilityChange = () => {
+      if (document.hidden) {
+        finish();
+      }
+    };
+
+    const tick = () => {
+      position = Math.min(text.length, position + charsPerTick);
+      if (position >= text.length) {
+        finish();
+        return;
+      }
+      onUpdate(text.slice(0, position));
+      timer = setTimeout(tick, TICK_MS);
+    };
+
+    document.addEventListener('visibilitychange', onVisibilityChange);
+    tick();
+  });
+};